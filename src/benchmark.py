@@ -0,0 +1,205 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
+
+    src/benchmark.py
+
+    python src/benchmark.py trace
+    uv run src/benchmark.py trace
+    uv run src/benchmark.py timestamp
+    uv run src/benchmark.py decorator
+    uv run src/benchmark.py listdir
+
+    micro benchmarks for the utilities
+
+    parameter:
+     - trace:     per call cost of Trace.info() -> caller, pattern, timestamp (no I/O), crash buffer
+     - timestamp: 1M Trace.info() lines -> /dev/null (timestamp with timezone variants)
+     - decorator: per call overhead of @duration, @retry_exception and @type_check (label with/without placeholders)
+     - listdir:   folder listing of a synthetic folder with 100k entries (os.listdir + is_file() vs. os.scandir)
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+from utils.decorator import duration, retry_exception, type_check
+from utils.file import get_files_in_folder, listdir_match_extention
+from utils.trace import Trace
+
+def measure(name: str, func: Callable[[], None], calls: int, repeats: int = 5) -> None:
+    results: List[float] = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for _ in range(calls):
+            func()
+        results.append((time.perf_counter() - start_time) / calls)
+
+    best   = min(results) * 1_000_000
+    median = statistics.median(results) * 1_000_000
+    print(f"{name:<40} best {best:8.2f} µs/call   median {median:8.2f} µs/call   ({calls} calls x {repeats})")
+
+def call_nested(depth: int, func: Callable[[], None]) -> None:
+    if depth > 0:
+        call_nested(depth - 1, func)
+    else:
+        func()
+
+def bench_trace(calls: int) -> None:
+    def null_output(_text: str) -> None:
+        pass
+
+    Trace.redirect(null_output)
+
+    def trace_info() -> None:
+        Trace.info("benchmark message", 42)
+
+    def trace_error() -> None:
+        Trace.error("benchmark message")
+
+    def trace_debug() -> None:
+        Trace.debug("benchmark message", 42)
+
+    def trace_nested() -> None:
+        call_nested(25, trace_info)
+
+    measure("Trace.info()", trace_info, calls)
+    measure("Trace.error()", trace_error, calls)
+    measure("Trace.info() - stack depth 25", trace_nested, calls)
+
+    Trace.set(show_caller=False)
+    measure("Trace.info() - show_caller=False", trace_info, calls)
+    Trace.set(show_caller=True)
+
+    measure("Trace.debug() - suppressed", trace_debug, calls)
+
+    Trace.crash_init(size=10_000, hook=False)
+    measure("Trace.info() - crash buffer", trace_info, calls)
+    measure("Trace.debug() - crash buffer", trace_debug, calls)
+    Trace.crash_init(size=0)
+
+def bench_timestamp(lines: int) -> None:
+    stdout = sys.stdout
+
+    for timezone in [False, True, "UTC"]:
+        with open(os.devnull, mode="w", encoding="utf-8") as devnull:  # noqa: PTH123
+            sys.stdout = devnull
+            Trace.set(timezone=timezone) # after the redirection -> tty check
+
+            start_time = time.perf_counter()
+            for i in range(lines):
+                Trace.info("benchmark message", i)
+            total_time = time.perf_counter() - start_time
+
+            sys.stdout = stdout
+
+        print(f"timezone={timezone!s:<6} {lines} lines -> /dev/null: {total_time:7.3f} sec  ({total_time / lines * 1_000_000:.2f} µs/line)")
+
+def bench_decorator(calls: int) -> None:
+    def null_output(_text: str) -> None:
+        pass
+
+    Trace.redirect(null_output)
+
+    def plain(name: str, number: int = 99) -> None:
+        pass
+
+    @duration("plain")
+    def duration_text(name: str, number: int = 99) -> None:
+        pass
+
+    @duration("{__name__}: {0} {number}")
+    def duration_args(name: str, number: int = 99) -> None:
+        pass
+
+    @duration(aggregate=True)
+    def duration_aggregate(name: str, number: int = 99) -> None:
+        pass
+
+    @duration("plain", memory=True)
+    def duration_memory(name: str, number: int = 99) -> None:
+        pass
+
+    @retry_exception("{__name__}: {0}")
+    def retry_args(name: str, number: int = 99) -> None:
+        pass
+
+    @type_check
+    def type_checked(name: str, number: int = 99) -> None:
+        pass
+
+    measure("function (not decorated)", lambda: plain("Max"), calls)
+    measure("@duration('plain')", lambda: duration_text("Max"), calls)
+    measure("@duration('{__name__}: {0} {number}')", lambda: duration_args("Max"), calls)
+    measure("@duration(aggregate=True)", lambda: duration_aggregate("Max"), calls)
+    measure("@duration('plain', memory=True)", lambda: duration_memory("Max"), calls)
+    measure("@retry_exception('{__name__}: {0}')", lambda: retry_args("Max"), calls)
+    measure("@type_check", lambda: type_checked("Max", number=1), calls)
+
+# listing before os.scandir: one stat() per entry (is_file) + loop over the extensions
+
+def listdir_stat(path: Path, extensions: List[str]) -> List[str]:
+    files: List[str] = []
+    for file in os.listdir(path):
+        if (path / file).is_file():
+            for extention in extensions:
+                if file.endswith("." + extention):
+                    files.append(file)
+                    break
+    return files
+
+def bench_listdir(entries: int) -> None:
+    Trace.redirect(lambda _text: None)
+
+    extensions = ["zip", "story", "xlsx", "docx", "json"]
+    suffixes   = [".zip", ".story", ".xlsx", ".docx", ".json", ".txt", ".xml", ".png"]
+
+    path = Path(tempfile.mkdtemp(prefix="benchmark_listdir_"))
+    try:
+        start_time = time.perf_counter()
+        for i in range(entries):
+            if i % 100 == 0:
+                (path / f"folder_{i:06d}").mkdir()
+            else:
+                (path / f"file_{i:06d}{suffixes[i % len(suffixes)]}").touch()
+        print(f"{entries} entries created: {time.perf_counter() - start_time:.3f} sec")
+
+        variants: List[Tuple[str, Callable[[], Any]]] = [
+            ("os.listdir + is_file() + extension loop", lambda: listdir_stat(path, extensions)),
+            ("listdir_match_extention (os.scandir)",    lambda: listdir_match_extention(path, extensions)),
+            ("get_files_in_folder (os.scandir)",        lambda: get_files_in_folder(path)),
+        ]
+        for name, func in variants:
+            results: List[float] = []
+            for _ in range(5):
+                start_time = time.perf_counter()
+                func()
+                results.append(time.perf_counter() - start_time)
+            print(f"{name:<40} best {min(results) * 1_000:8.2f} ms   median {statistics.median(results) * 1_000:8.2f} ms   ({entries} entries x 5)")
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="micro benchmarks for the utilities")
+    parser.add_argument("benchmark", choices=["trace", "timestamp", "decorator", "listdir"], help="benchmark to run")
+    parser.add_argument("-n", "--calls", type=int, default=None, help="calls per repeat (trace, decorator: 10_000, timestamp: 1_000_000), entries (listdir: 100_000)")
+    args: Any = parser.parse_args()
+
+    if args.benchmark == "trace":
+        bench_trace(args.calls or 10_000)
+
+    elif args.benchmark == "timestamp":
+        bench_timestamp(args.calls or 1_000_000)
+
+    elif args.benchmark == "decorator":
+        bench_decorator(args.calls or 10_000)
+
+    elif args.benchmark == "listdir":
+        bench_listdir(args.calls or 100_000)
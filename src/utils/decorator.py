@@ -1,32 +1,70 @@
 """
-    © Jürgen Schoenemeyer, 24.05.2025 19:14
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
 
     src/utils/decorator.py
 
-    PUBLIC:
-     - @duration(text: str=None, rounds: int=1)
+    PUBLIC (also for async def):
+     - @duration(text: str=None, rounds: int=1, warmup: int=0, disable_gc: bool=False, outliers: bool=False, aggregate: bool=False, memory: bool=False)
+     - duration.report(reset: bool=False) # aggregated durations, sorted by total time (also at exit)
      - @deprecated(message: str="")
-     - @retry_exception(text: str="", exception=Exception, delay: int|float=1, retries: int=5)
+     - @retry_exception(text: str="", *, exception=Exception, delay: int|float=1, retries: int=5, backoff: float=1, max_delay: float=None, jitter: str=None, deadline: float=None, budget: RetryBudget=None)
+     - RetryBudget(capacity: float=10, per_second: float=1) # shared by several @retry_exception
+     - @memoize(maxsize: int|None=128, ttl: float|None=None, persist: Path|str|None=None)
+       -> func.cache_info() -> Dict, func.cache_clear(disk: bool=False)
+     - @profile(text: str=None, top: int=5, folder: Path|str|None=None, output: str="pstats") # "collapsed"
+     - @type_check / @type_check(*expected_types: type) # annotations -> TypeError (args, kwargs, return value)
+     - type_check_enable(enabled: bool) # False (or environment TYPE_CHECK=0): no wrapper at all
+
+     - with duration_cm(name: str, *, rounds: int=1, warmup: int=0, disable_gc: bool=False, outliers: bool=False, aggregate: bool=False, memory: bool=False): ...
+       @duration_cm(...) # as decorator
+     - with profile_cm(name: str, top: int=5, folder: Path|str|None=None, output: str="pstats"): ... # inline code -> "<block>"
 
     PRIVATE:
      - get_args_values(func: Callable, *args: Any, **kwargs: Any) -> Tuple[List, Dict]
      - replace_arguments(match: Match, func_name: str, *args: Any, **kwargs: Any) -> str
+     - Label(func: Callable, text: str).render(args: Tuple, kwargs: Dict) -> str
+     - get_statistics(times: List[float], outliers: bool=False) -> Dict[str, float]
+     - trace_duration(pretext: str, times: List[float], warmup: int, outliers: bool, memory: Tuple[int, int]|None=None) -> None
+     - memory_start() -> Tuple[bool, int], memory_stop(state: Tuple[bool, int]) -> Tuple[int, int] # tracemalloc: peak, net
+     - DurationRun(*, disable_gc: bool, memory: bool) # context of one @duration call -> begin_rounds(), start(), stop(), times, memory_usage
+     - trace_deprecated(function_name: str, text: str) -> None
+     - TypeChecker(func: Callable, explicit_types: Tuple=()) -> check_arguments(args, kwargs), check_result(result)
+     - get_check_types(annotation: Any) -> Tuple[type, ...]|None
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
 import contextlib
+import cProfile
 import functools
+import gc
+import glob
+import hashlib
 import inspect
+import math
+import os
+import pickle
+import pstats
+import random
 import re
+import statistics
+import threading
 import time
+import tracemalloc
+import types
+import typing
 
+from collections import OrderedDict
 from inspect import BoundArguments, Signature
-from typing import TYPE_CHECKING, Any, Dict, Generator, Match, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Match, Self, Tuple
 
-from utils.trace import Color, Trace
+from utils.trace import Color, Trace, get_file_time
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
+    from types import TracebackType
 
 """ Decorator '@my_decorator'
 
@@ -93,53 +131,96 @@ def wrapper(*args: Any, **kwargs: Any) -> Any:
 # @duration("{__name__} 2: {name} {number} {type}")
 # @duration("{__name__} 1: {0|name} {1|number} {2|type}", rounds=1)
 # @duration(text="{__name__} 0: {0} {1} {2}", rounds=1)
-
-def duration(special: Callable[..., Any] | str | None = None, *, text: str | None = None, rounds: int=1) -> Callable[..., Any]:
+#
+# benchmark: the function is called warmup + rounds times (the result of the last call is returned)
+# @duration("parse", rounds=100, warmup=5)                  -> min, median, p95, p99, stdev
+# @duration("parse", rounds=100, disable_gc=True, outliers=True) -> no gc during the rounds, outliers removed (1.5 IQR)
+#
+# aggregate: no trace per call, count/total/min/max/histogram per function (module.qualname or explicit constant text) -> duration.report() and at exit
+# @duration(aggregate=True)
+
+def duration(
+    special: Callable[..., Any] | str | None = None,
+    *,
+    text: str | None = None,
+    rounds: int = 1,
+    warmup: int = 0,
+    disable_gc: bool = False,
+    outliers: bool = False,
+    aggregate: bool = False,
+    memory: bool = False,
+) -> Callable[..., Any]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-        @functools.wraps(wrapped=func)
-        def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
-
-            function_name = "unknown"
-            if hasattr(func, "__name__"):
-                function_name = str(func.__name__)
-
-
-            # get all input args & kwargs of the decorated function
-            args_values, kwargs_values = get_args_values(func, *args, **kwargs)
+        if isinstance(special, str): # text as arg
+            label = Label(func, special)
+            explicit = True
+
+        elif text is None:           # text as kwarg
+            label = Label(func, "{__name__}")
+            explicit = False
+        else:
+            label = Label(func, text)
+            explicit = True
+
+        # aggregate: explicit constant label, otherwise module + qualname
+        #  - labels with arguments would split the statistics
+        #  - __name__ would merge methods of different classes
+
+        stats: DurationStats | None = None
+        if aggregate:
+            if explicit and label.text:
+                key = label.text
+            else:
+                key = f"{getattr(func, '__module__', None) or '?'}.{getattr(func, '__qualname__', label.function_name)}"
+            stats = get_duration_stats(key)
 
-            # before
-            start_time = time.perf_counter()
+        def report(run: DurationRun, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+            if stats is not None:
+                stats.add(run.times, run.memory_usage)
+            else:
+                trace_duration(label.render(args, kwargs), run.times, warmup, outliers, run.memory_usage)
 
-            # decorated function
-            result = func(*args, **kwargs)
+        @functools.wraps(wrapped=func)
+        def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            with DurationRun(disable_gc=disable_gc, memory=memory) as run:
+                for _ in range(warmup):
+                    func(*args, **kwargs)
 
-            # after
-            total_time = (time.perf_counter() - start_time) / rounds
+                run.begin_rounds()
+                for _ in range(max(1, rounds)):
 
-            if isinstance(special, str): # text as arg
-                pretext = special
+                    # before
+                    run.start()
 
-            elif text is None:           # text as kwarg
-                pretext = function_name
-            else:
-                pretext = text
+                    # decorated function
+                    result = func(*args, **kwargs)
 
-            # replace arg, kwarg: {0} or {0|name} or {0|name} or {__name__}
-            # args_values: ['Max', 99, False], kwargs_values: {'name': 'Max', 'number': 99, 'type': False}
+                    # after
+                    run.stop()
 
-            def replace(match: Match[str]) -> str:
-                return replace_argument_values(match, function_name, args_values, kwargs_values)
-
-            pattern = r"\{(.*?)\}"
-            pretext = re.sub(pattern, replace, pretext)
+            report(run, args, kwargs)
+            return result
 
-            duration_text = f"{Color.GREEN}{Color.BOLD}{total_time:.3f} sec{Color.RESET}"
-            if pretext == "":
-                Trace.decorator(f"{duration_text}", path="duration")
-            else:
-                Trace.decorator(f"{pretext}: {duration_text}", path="duration")
+        # async def -> the awaited execution is measured
+        #  - memory: tracemalloc is process-wide -> allocations of concurrent tasks are included
 
+        @functools.wraps(wrapped=func)
+        async def async_wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            with DurationRun(disable_gc=disable_gc, memory=memory) as run:
+                for _ in range(warmup):
+                    await func(*args, **kwargs)
+
+                run.begin_rounds()
+                for _ in range(max(1, rounds)):
+                    run.start()
+                    result = await func(*args, **kwargs)
+                    run.stop()
+
+            report(run, args, kwargs)
             return result
+
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
 
     # if callable(special):
@@ -152,6 +233,46 @@ def replace(match: Match[str]) -> str:
 
     return decorator(func=special) # @duration
 
+# one call of a @duration function (sync and async wrapper): gc off, tracemalloc, times of the rounds
+#  - gc and tracemalloc are restored also on exceptions
+
+class DurationRun:
+    def __init__(self, *, disable_gc: bool, memory: bool) -> None:
+        self.disable_gc = disable_gc
+        self.memory     = memory
+        self.gc_enabled = gc.isenabled()
+        self.start_time = 0.0
+
+        self.times: List[float] = []
+        self.memory_state: Tuple[bool, int] | None = None
+        self.memory_usage: Tuple[int, int] | None = None
+
+    def __enter__(self) -> Self:
+        if self.disable_gc:
+            gc.collect()
+            gc.disable()
+        return self
+
+    # after the warmup calls
+
+    def begin_rounds(self) -> None:
+        if self.memory:
+            self.memory_state = memory_start()
+
+    def start(self) -> None:
+        self.start_time = time.perf_counter()
+
+    def stop(self) -> None:
+        self.times.append(time.perf_counter() - self.start_time)
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        if self.memory_state is not None:
+            self.memory_usage = memory_stop(self.memory_state)
+            self.memory_state = None
+
+        if self.disable_gc and self.gc_enabled:
+            gc.enable()
+
 # @deprecated
 # @deprecated()
 # @deprecated("licence does not fit")
@@ -159,32 +280,35 @@ def replace(match: Match[str]) -> str:
 
 def deprecated(special: Callable[..., Any] | str | None = None, *, message: str | None = None) -> Callable[..., Any]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-        @functools.wraps(wrapped=func)
-        def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+        function_name = str(getattr(func, "__name__", "unknown"))
 
-            function_name = "unknown"
-            if hasattr(func, "__name__"):
-                function_name = str(func.__name__)
+        text = ""
+        if isinstance(special, str): # message as arg
+            text = special
 
-            text = ""
-            if isinstance(special, str): # message as arg
-                text = special
+        elif message is not None:    # message as kwarg
+            text = message
 
-            elif message is not None:    # message as kwarg
-                text = message
+        @functools.wraps(wrapped=func)
+        def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
 
             # before ...
 
-            if text == "":
-                Trace.decorator(f"{Color.RED}'{function_name}' is deprecated{Color.RESET}", path="deprecated")
-            else:
-                Trace.decorator(f"{Color.RED}'{function_name}' is deprecated ({text}){Color.RESET}", path="deprecated")
+            trace_deprecated(function_name, text)
 
             result = func(*args, **kwargs)
 
             # after ...
 
             return result
+
+        @functools.wraps(wrapped=func)
+        async def async_wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            trace_deprecated(function_name, text)
+            return await func(*args, **kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
 
     # if callable(special):
@@ -197,6 +321,12 @@ def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
 
     return decorator(func=special) # @duration
 
+def trace_deprecated(function_name: str, text: str) -> None:
+    if text == "":
+        Trace.decorator(f"{Color.RED}'{function_name}' is deprecated{Color.RESET}", path="deprecated")
+    else:
+        Trace.decorator(f"{Color.RED}'{function_name}' is deprecated ({text}){Color.RESET}", path="deprecated")
+
 """
 def deprecated(message: str="") -> Callable[..., Any]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -223,50 +353,441 @@ def wrapper(*args: Any, **kwargs: Any) -> Any:
 # @retry_exception(exception=ValueError)
 # @retry_exception("error limit '{0}'", exception=ValueError)
 # @retry_exception("ttx => font '{0}'", exception=ValueError, delay=2.5, retries=10)
-
-def retry_exception(text: str | None = None, exception: type[BaseException] = Exception, delay: float = 1, retries: int = 5) -> Callable[..., Any]:
+#
+# backoff: delay * backoff ** (attempt - 1), limited by max_delay
+#  - jitter="full":         random between 0 and the backoff delay
+#  - jitter="decorrelated": random between delay and 3 * previous delay (limited by max_delay)
+#  - deadline:              no further attempt, if the total time (sec) would be exceeded
+#  - budget:                RetryBudget shared by several call sites -> no retry storm, if a dependency fails
+#
+# @retry_exception("download '{0}'", exception=OSError, delay=0.5, backoff=2, max_delay=30, jitter="full", deadline=120, budget=network_budget)
+#
+# after the last attempt the last exception is raised again (with its traceback)
+
+def retry_exception(
+    text: str | None = None,
+    *,
+    exception: type[BaseException] = Exception,
+    delay: float = 1,
+    retries: int = 5,
+    backoff: float = 1,
+    max_delay: float | None = None,
+    jitter: str | None = None,
+    deadline: float | None = None,
+    budget: RetryBudget | None = None,
+) -> Callable[..., Any]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        label  = Label(func, "{__name__}" if text is None else text)
+        policy = RetryPolicy(retries=retries, delay=delay, backoff=backoff, max_delay=max_delay, jitter=jitter, deadline=deadline, budget=budget)
+
         @functools.wraps(func)
         def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            attempts   = 0
+            sleep      = delay
+            start_time = time.monotonic()
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except exception as _err:
+                    attempts += 1
+                    next_sleep = policy.next_delay(label.render(args, kwargs), attempts, sleep, start_time)
+                    if next_sleep is None:
+                        raise
 
-            function_name = "unknown"
-            if hasattr(func, "__name__"):
-                function_name = str(func.__name__)
-
-            # get all input args & kwargs of the decorated function
-            args_values, kwargs_values = get_args_values(func, *args, **kwargs)
-
-            if text is None:
-                pretext = function_name
-            else:
-                def replace(match: Match[str]) -> str:
-                    return replace_argument_values(match, function_name, args_values, kwargs_values)
+                sleep = next_sleep
+                time.sleep(sleep)
 
-                pattern = r"\{(.*?)\}"
-                pretext = re.sub(pattern, replace, text)
+        # async def -> asyncio.sleep() (the event loop is not blocked)
 
-            attempts = 0
-            while attempts < retries:
+        @functools.wraps(func)
+        async def async_wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            attempts   = 0
+            sleep      = delay
+            start_time = time.monotonic()
+            while True:
                 try:
-                    return func(*args, **kwargs)
+                    return await func(*args, **kwargs)
                 except exception as _err:
                     attempts += 1
-                    attempts_text = f"{Color.RED}{Color.BOLD}failed ({attempts}/{retries}){Color.RESET}"
-                    if pretext == "":
-                        Trace.decorator(f"{attempts_text}", path="retry")
-                    else:
-                        Trace.decorator(f"{pretext}: {attempts_text}", path="retry")
+                    next_sleep = policy.next_delay(label.render(args, kwargs), attempts, sleep, start_time)
+                    if next_sleep is None:
+                        raise
 
-                    time.sleep(delay)
+                sleep = next_sleep
+                await asyncio.sleep(sleep)
 
-            raise exception
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
     return decorator
 
+retry_jitters = [None, "full", "decorrelated"]
+
+class RetryPolicy:
+    def __init__(
+        self,
+        *,
+        retries: int,
+        delay: float,
+        backoff: float,
+        max_delay: float | None,
+        jitter: str | None,
+        deadline: float | None,
+        budget: RetryBudget | None,
+    ) -> None:
+        if jitter not in retry_jitters:
+            Trace.error(f"jitter '{jitter}' unknown -> {retry_jitters}")
+            jitter = None
+
+        self.retries   = retries
+        self.delay     = delay
+        self.backoff   = backoff
+        self.max_delay = max_delay
+        self.jitter    = jitter
+        self.deadline  = deadline
+        self.budget    = budget
+
+    # failed attempt -> trace + sleep time for the next attempt (None: no further attempt)
+
+    def next_delay(self, pretext: str, attempts: int, previous: float, start_time: float) -> float | None:
+        attempts_text = f"{Color.RED}{Color.BOLD}failed ({attempts}/{self.retries}){Color.RESET}"
+
+        reason = ""
+        sleep: float | None = None
+
+        if attempts < self.retries:
+            if self.jitter == "decorrelated":
+                sleep = random.uniform(self.delay, max(self.delay, previous * 3))  # noqa: S311
+            else:
+                sleep = self.delay * self.backoff ** (attempts - 1)
+                if self.jitter == "full":
+                    sleep = random.uniform(0, sleep)  # noqa: S311
+
+            if self.max_delay is not None:
+                sleep = min(sleep, self.max_delay)
+
+            if self.deadline is not None and time.monotonic() - start_time + sleep > self.deadline:
+                sleep  = None
+                reason = f" - deadline {self.deadline} sec"
+
+            elif self.budget is not None and not self.budget.acquire():
+                sleep  = None
+                reason = " - retry budget exhausted"
+
+        if pretext == "":
+            Trace.decorator(f"{attempts_text}{reason}", path="retry")
+        else:
+            Trace.decorator(f"{pretext}: {attempts_text}{reason}", path="retry")
+
+        return sleep
+
+# retry budget: token bucket shared by several call sites (thread-safe)
+#  - each retry takes one token, per_second tokens are added again (up to capacity)
+#
+# network_budget = RetryBudget(capacity=10, per_second=0.5)
+
+class RetryBudget:
+    def __init__(self, capacity: float = 10, per_second: float = 1) -> None:
+        self.capacity   = capacity
+        self.per_second = per_second
+        self.tokens     = capacity
+        self.last       = time.monotonic()
+        self.lock       = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.per_second)
+            self.last = now
+
+            if self.tokens < 1:
+                return False
+
+            self.tokens -= 1
+            return True
+
+# @memoize
+# @memoize(maxsize=128)            -> LRU: least recently used results are removed
+# @memoize(ttl=3600)               -> results expire after 1 hour
+# @memoize(persist="./.cache")     -> results are also stored on disk (survive the run)
+#
+# key: bound arguments incl. default values -> f(1) and f(x=1) share the result
+#      unhashable arguments (list, dict, set) are converted, other unhashable arguments -> no caching
+#
+# persist: pickle files "<module>.<qualname> • <sha256 of the arguments>.pickle" (only for trusted folders)
+#
+# get_media_info.cache_info()  -> {"hits": 12, "misses": 3, "disk_hits": 2, "evictions": 0, "size": 3, "maxsize": 128}
+# get_media_info.cache_clear() -> memory (and disk files)
+
+def memoize(
+    special: Callable[..., Any] | None = None,
+    *,
+    maxsize: int | None = 128,
+    ttl: float | None = None,
+    persist: Path | str | None = None,
+) -> Callable[..., Any]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        cache = MemoCache(func, maxsize, ttl, persist)
+
+        @functools.wraps(func)
+        def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            key = cache.get_key(args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+
+            found, result = cache.get(key)
+            if not found:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            key = cache.get_key(args, kwargs)
+            if key is None:
+                return await func(*args, **kwargs)
+
+            found, result = cache.get(key)
+            if not found:
+                result = await func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        result_wrapper: Any = async_wrapper if inspect.iscoroutinefunction(func) else wrapper
+        result_wrapper.cache_info  = cache.info
+        result_wrapper.cache_clear = cache.clear
+        return result_wrapper
+
+    if special is None:
+        return decorator # @memoize(...)
+
+    return decorator(special) # @memoize
+
+class MemoCache:
+    def __init__(self, func: Callable[..., Any], maxsize: int | None, ttl: float | None, persist: Path | str | None) -> None:
+        self.name    = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', 'unknown')}"
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self.path    = None if persist is None else Path(persist)
+
+        self.signature: Signature | None = None
+        with contextlib.suppress(TypeError, ValueError): # no signature e.g. some builtins
+            self.signature = inspect.signature(func)
+
+        self.entries: OrderedDict[Any, Tuple[float, Any]] = OrderedDict() # key -> (expires (monotonic), result)
+        self.lock = threading.Lock()
+
+        self.hits      = 0
+        self.misses    = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    # (("name", "Max"), ("number", 99)) or None (unhashable, arguments do not match the signature)
+
+    def get_key(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        try:
+            if self.signature is None:
+                key = get_hashable((args, kwargs))
+            else:
+                _args_values, kwargs_values = bind_args_values(self.signature, args, kwargs)
+                key = get_hashable(kwargs_values)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] >= time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+
+                del self.entries[key]
+
+        if self.path is not None:
+            found, result = self.load(key)
+            if found:
+                with self.lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self.store(key, result)
+                return True, result
+
+        with self.lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: Any, result: Any) -> None:
+        with self.lock:
+            self.store(key, result)
+
+        if self.path is not None:
+            self.save(key, result)
+
+    def store(self, key: Any, result: Any) -> None:
+        expires = math.inf if self.ttl is None else time.monotonic() + self.ttl
+        self.entries[key] = (expires, result)
+        self.entries.move_to_end(key)
+
+        if self.maxsize is not None:
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def info(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "size":      len(self.entries),
+                "maxsize":   self.maxsize,
+            }
+
+    def clear(self, disk: bool = False) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+        if disk and self.path is not None and self.path.is_dir():
+            for file_path in self.path.glob(f"{glob.escape(self.name)} • *.pickle"):
+                try:
+                    file_path.unlink()
+                except OSError as e:
+                    Trace.error(f"memoize: {e}")
+
+    # disk: "<module>.<qualname> • <sha256>.pickle" -> (created (time.time()), result)
+
+    def get_file_path(self, key: Any) -> Path | None:
+        if self.path is None:
+            return None
+
+        try:
+            data = pickle.dumps((self.name, key), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
+        return self.path / f"{self.name} • {hashlib.sha256(data).hexdigest()[:32]}.pickle"
+
+    def load(self, key: Any) -> Tuple[bool, Any]:
+        file_path = self.get_file_path(key)
+        if file_path is None:
+            return False, None
+
+        try:
+            with file_path.open(mode="rb") as file:
+                created, result = pickle.load(file)  # noqa: S301
+        except FileNotFoundError:
+            return False, None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError) as e:
+            Trace.warning(f"memoize: '{file_path.name}' {e}")
+            return False, None
+
+        if self.ttl is not None and time.time() - created > self.ttl:
+            return False, None
+
+        return True, result
+
+    def save(self, key: Any, result: Any) -> None:
+        file_path = self.get_file_path(key)
+        if file_path is None:
+            return
+
+        try:
+            data = pickle.dumps((time.time(), result), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            Trace.warning(f"memoize: '{self.name}' result not picklable - {e}")
+            return
+
+        temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(data)
+            temp_path.replace(file_path)
+        except OSError as e:
+            Trace.error(f"memoize: {e}")
+            with contextlib.suppress(OSError):
+                temp_path.unlink()
+
+# arguments -> hashable (list -> tuple, dict -> sorted tuple of items, set -> sorted tuple)
+#  - sorted, not frozenset: the pickled key (persist) must not depend on the string hash order of the run
+
+def get_hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(get_sorted((key, get_hashable(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(get_hashable(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(get_sorted(get_hashable(item) for item in value)))
+    return value
+
+# mixed types (1, "a") are not comparable -> sorted by repr
+
+def get_sorted(items: Iterable[Any]) -> List[Any]:
+    items = list(items)
+    try:
+        return sorted(items)
+    except TypeError:
+        return sorted(items, key=repr)
+
+# label template e.g. "{__name__} 1: {0|name} {1|number}" -> parsed once at decoration time
+#  - without argument placeholders: constant text, no binding per call
+#  - with argument placeholders:    inspect.signature() once, bind_partial only when the label is rendered
+
+placeholder_pattern = re.compile(r"\{(.*?)\}")
+
+class Label:
+    def __init__(self, func: Callable[..., Any], text: str) -> None:
+        self.function_name = str(getattr(func, "__name__", "unknown"))
+
+        # "a {0|name} b" -> ["a ", ("0", "name"), " b"]
+
+        self.parts: List[str | Tuple[str, ...]] = []
+        for i, part in enumerate(placeholder_pattern.split(text)):
+            if i % 2 == 0:
+                self.parts.append(part)
+            elif part == "__name__":
+                self.parts.append(self.function_name)
+            else:
+                self.parts.append(tuple(part.split("|")))
+
+        self.text: str | None = None
+        self.signature: Signature | None = None
+
+        if all(isinstance(part, str) for part in self.parts):
+            self.text = "".join(part for part in self.parts if isinstance(part, str))
+        else:
+            with contextlib.suppress(TypeError, ValueError): # no signature e.g. some builtins
+                self.signature = inspect.signature(func)
+
+    def render(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+        if self.text is not None:
+            return self.text
+
+        args_values: Tuple[Any, ...] = ()
+        kwargs_values: Dict[str, Any] = {}
+        if self.signature is not None:
+            with contextlib.suppress(TypeError): # arguments do not match the signature
+                args_values, kwargs_values = bind_args_values(self.signature, args, kwargs)
+
+        text = ""
+        for part in self.parts:
+            if isinstance(part, str):
+                text += part
+            else:
+                text += get_argument_value(part, self.function_name, args_values, kwargs_values)
+        return text
+
 # get args and kwargs values -> default values are considered
 
 def get_args_values(func: Callable[..., Any], *args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[Any, Any]]:
-    sig: Signature = inspect.signature(func)
+    return bind_args_values(inspect.signature(func), args, kwargs)
+
+def bind_args_values(sig: Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[Any, Any]]:
     bound_args: BoundArguments = sig.bind_partial(*args, **kwargs)
     bound_args.apply_defaults()
 
@@ -282,12 +803,13 @@ def get_args_values(func: Callable[..., Any], *args: Tuple[Any, ...], **kwargs:
 # args_values: ['Max', 99, False], kwargs_values: {'name': 'Max', 'number': 99, 'type': False}
 
 def replace_argument_values(match: Match[str], func_name: str, args_values: Tuple[Any, ...], kwargs_values: Dict[str, Any]) -> str:
-    arguments = match.group(1)
+    return get_argument_value(tuple(match.group(1).split("|")), func_name, args_values, kwargs_values)
 
-    if arguments == "__name__":
+def get_argument_value(arguments: Tuple[str, ...], func_name: str, args_values: Tuple[Any, ...], kwargs_values: Dict[str, Any]) -> str:
+    if arguments == ("__name__",):
         return(func_name)
 
-    for argument in arguments.split("|"):
+    for argument in arguments:
         if argument.isnumeric():
             # args_values: {0} -> args_values[0]
             pos = int(argument)
@@ -301,40 +823,673 @@ def replace_argument_values(match: Match[str], func_name: str, args_values: Tupl
 
     return ""
 
+# times (sec) -> {"min", "median", "p95", "p99", "stdev", "rounds", "outliers"}
+#  - percentiles: linear interpolation between the closest ranks
+#  - outliers=True: values outside of [Q1 - 1.5 IQR, Q3 + 1.5 IQR] are removed
+
+def get_statistics(times: List[float], outliers: bool = False) -> Dict[str, float]:
+    values = sorted(times)
+    count  = len(values)
+
+    if outliers and count >= 4:
+        q1  = get_percentile(values, 25)
+        q3  = get_percentile(values, 75)
+        iqr = q3 - q1
+        values = [value for value in values if q1 - 1.5 * iqr <= value <= q3 + 1.5 * iqr]
+
+    return {
+        "min":      values[0],
+        "median":   get_percentile(values, 50),
+        "p95":      get_percentile(values, 95),
+        "p99":      get_percentile(values, 99),
+        "stdev":    statistics.stdev(values) if len(values) > 1 else 0.0,
+        "rounds":   len(values),
+        "outliers": count - len(values),
+    }
+
+def get_percentile(values: List[float], percent: float) -> float:
+    pos = (len(values) - 1) * percent / 100
+    low = math.floor(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+# 1.234 sec, 12.345 ms, 12.3 µs
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} sec"
+    if seconds >= 0.001:
+        return f"{seconds * 1_000:.3f} ms"
+    return f"{seconds * 1_000_000:.1f} µs"
+
+# 512 B, 12.3 KB, 1.5 MB, 2.1 GB (sign=True: +/-)
+
+def format_bytes(size: float, sign: bool = False) -> str:
+    prefix = ("+" if size >= 0 else "-") if sign else ""
+    size = abs(size)
+    for unit in ["B", "KB", "MB"]:
+        if size < 1024:
+            return f"{prefix}{size:.0f} {unit}" if unit == "B" else f"{prefix}{size:.1f} {unit}"
+        size /= 1024
+    return f"{prefix}{size:.1f} GB"
+
+# memory=True: tracemalloc (started on demand, stopped again if it was not tracing before)
+#  - peak: highest traced memory above the start value
+#  - net:  traced memory after - before (still referenced allocations, e.g. the result)
+#  - nested measurements: reset_peak() of the inner call lowers the peak of the outer call
+
+def memory_start() -> Tuple[bool, int]:
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    tracemalloc.reset_peak()
+    return started, tracemalloc.get_traced_memory()[0]
+
+def memory_stop(state: Tuple[bool, int]) -> Tuple[int, int]:
+    started, start_size = state
+    current, peak = tracemalloc.get_traced_memory()
+    if started:
+        tracemalloc.stop()
+
+    return max(0, peak - start_size), current - start_size
+
+# one round   -> "pretext: 1.486 sec"
+# more rounds -> "pretext: median 1.234 ms (min 1.201 ms, p95 1.456 ms, p99 1.502 ms, stdev 0.051 ms, 100 rounds, 5 warmup)"
+# memory      -> "pretext: 1.486 sec - memory: peak 12.3 MB, net +1.2 MB"
+
+def trace_duration(pretext: str, times: List[float], warmup: int, outliers: bool, memory: Tuple[int, int] | None = None) -> None:
+    if len(times) == 1:
+        duration_text = f"{Color.GREEN}{Color.BOLD}{times[0]:.3f} sec{Color.RESET}"
+    else:
+        stats = get_statistics(times, outliers)
+
+        details = [
+            f"min {format_seconds(stats['min'])}",
+            f"p95 {format_seconds(stats['p95'])}",
+            f"p99 {format_seconds(stats['p99'])}",
+            f"stdev {format_seconds(stats['stdev'])}",
+            f"{len(times)} rounds",
+        ]
+        if warmup > 0:
+            details.append(f"{warmup} warmup")
+        if outliers:
+            details.append(f"{stats['outliers']} outliers")
+
+        duration_text = f"{Color.GREEN}{Color.BOLD}median {format_seconds(stats['median'])}{Color.RESET} ({', '.join(details)})"
+
+    if memory is not None:
+        duration_text += f" - memory: peak {format_bytes(memory[0])}, net {format_bytes(memory[1], sign=True)}"
+
+    if pretext == "":
+        Trace.decorator(f"{duration_text}", path="duration")
+    else:
+        Trace.decorator(f"{pretext}: {duration_text}", path="duration")
+
+# aggregated durations (process-wide): name -> count, total, min, max, histogram (memory: max peak, total net)
+#  - histogram: 4 buckets per power of two (ns) -> percentiles with ~12% resolution, constant memory
+
+duration_registry: Dict[str, DurationStats] = {}
+duration_lock = threading.Lock()
+duration_registered = False
+
+class DurationStats:
+    def __init__(self, name: str) -> None:
+        self.name  = name
+        self.count = 0
+        self.total = 0.0
+        self.min   = math.inf
+        self.max   = 0.0
+        self.histogram: Dict[int, int] = {}
+        self.reported = 0 # count at the last report
+
+        self.memory = False
+        self.peak   = 0
+        self.net    = 0
+
+    def add(self, times: List[float], memory: Tuple[int, int] | None = None) -> None:
+        with duration_lock:
+            if memory is not None:
+                self.memory = True
+                self.peak   = max(self.peak, memory[0])
+                self.net   += memory[1]
+
+            for seconds in times:
+                self.count += 1
+                self.total += seconds
+                self.min = min(self.min, seconds)
+                self.max = max(self.max, seconds)
+
+                mantissa, exponent = math.frexp(seconds * 1_000_000_000 + 1) # ns = mantissa * 2**exponent, 0.5 <= mantissa < 1
+                bucket = exponent * 4 + int(mantissa * 8) - 4
+                self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    # upper limit of the bucket which contains the percentile
+
+    def percentile(self, percent: float) -> float:
+        limit = self.count * percent / 100
+        total = 0
+        for bucket in sorted(self.histogram):
+            total += self.histogram[bucket]
+            if total >= limit:
+                exponent, sub = divmod(bucket, 4)
+                return min(self.max, (0.5 + (sub + 1) / 8) * 2 ** exponent / 1_000_000_000)
+        return self.max
+
+def get_duration_stats(name: str) -> DurationStats:
+    global duration_registered  # noqa: PLW0603
+
+    with duration_lock:
+        stats = duration_registry.get(name)
+        if stats is None:
+            stats = DurationStats(name)
+            duration_registry[name] = stats
+
+        if not duration_registered:
+            atexit.register(report_durations, changed_only=True)
+            duration_registered = True
+
+    return stats
+
+# duration.report() -> table sorted by total time
+#
+#  ooo  [duration] name                          calls      total       mean        min       ~p50       ~p95        max
+#  ooo  [duration] beautify_file                   120   12.345 sec   102.875 ms   ...
+#
+# with memory=True entries: additional columns "peak" (max) and "net" (total)
+
+def report_durations(reset: bool = False, changed_only: bool = False) -> None:
+    with duration_lock:
+        entries = sorted((stats for stats in duration_registry.values() if stats.count > 0), key=lambda stats: stats.total, reverse=True)
+        if not entries:
+            return
+
+        if changed_only and all(stats.count == stats.reported for stats in entries): # at exit: already reported
+            return
+
+        width = max(len(stats.name) for stats in entries)
+        memory = any(stats.memory for stats in entries)
+
+        header = f"{'name':<{width}} {'calls':>8} {'total':>12} {'mean':>12} {'min':>12} {'~p50':>12} {'~p95':>12} {'max':>12}"
+        if memory:
+            header += f" {'peak':>10} {'net':>10}"
+        Trace.decorator(header, path="duration")
+
+        for stats in entries:
+            values = [stats.total, stats.total / stats.count, stats.min, stats.percentile(50), stats.percentile(95), stats.max]
+            columns = " ".join(f"{format_seconds(value):>12}" for value in values)
+            if memory:
+                if stats.memory:
+                    columns += f" {format_bytes(stats.peak):>10} {format_bytes(stats.net, sign=True):>10}"
+                else:
+                    columns += f" {'-':>10} {'-':>10}"
+            Trace.decorator(f"{stats.name:<{width}} {stats.count:>8} {columns}", path="duration")
+            stats.reported = stats.count
+
+        if reset:
+            duration_registry.clear()
+
+duration.report = report_durations  # type: ignore[attr-defined]
+
 # https://www.youtube.com/watch?v=xI4TJyd8FGk&t=860s
 #
-# @type_check(int, int)
-#  - not for kwargs !
-#  - not using the existing annotation !
+# @type_check                  -> annotations of the parameters and the return value
+# @type_check(int, str)        -> explicit types for the first parameters (annotations for the rest)
+#
+#  - compiled once into isinstance() checks: args, kwargs, *args, **kwargs, return value
+#  - check before the call (arguments) and after the call (return value) -> TypeError
+#  - shallow: List[int] -> list, Dict[str, int] -> dict, Callable[..] -> Callable, float -> float | int
+#  - not checked: Any, object, TypeVar, Literal, non-runtime Protocols, unresolvable annotations (warning)
+#
+# disabled: environment TYPE_CHECK=0 or type_check_enable(False) before the import of the decorated modules
+#  -> the decorator returns the function itself (no wrapper, no cost)
+
+type_check_enabled = os.getenv("TYPE_CHECK", "1").lower() not in ["0", "false", "off"]
+
+def type_check_enable(enabled: bool) -> None:
+    global type_check_enabled  # noqa: PLW0603
+    type_check_enabled = enabled
+
+def type_check(*expected_types: Any) -> Callable[..., Any]:
+    bare = len(expected_types) == 1 and inspect.isroutine(expected_types[0])
+    explicit_types = () if bare else expected_types
 
-def type_check(*expected_types: type) -> Callable[..., Any]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if not type_check_enabled:
+            return func
+
+        checker = TypeChecker(func, explicit_types)
+
         @functools.wraps(wrapped=func)
         def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            checker.check_arguments(args, kwargs)
             result = func(*args, **kwargs)
+            if checker.result is not None:
+                checker.check_result(result)
+            return result
 
-            for arg, expected_type in zip(args, expected_types, strict=False):
-                if not isinstance(arg, expected_type):
-                    Trace.error("TypeError - expected {expected_type}, but got {type}")
-
+        @functools.wraps(wrapped=func)
+        async def async_wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            checker.check_arguments(args, kwargs)
+            result = await func(*args, **kwargs)
+            if checker.result is not None:
+                checker.check_result(result)
             return result
+
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
-    return decorator
+
+    if bare:
+        return decorator(expected_types[0]) # @type_check
+
+    return decorator # @type_check(...)
+
+class TypeChecker:
+    def __init__(self, func: Callable[..., Any], explicit_types: Tuple[Any, ...] = ()) -> None:
+        self.func = func
+        self.name = str(getattr(func, "__qualname__", getattr(func, "__name__", "function")))
+        self.explicit_types = explicit_types
+        self.compiled = False
+        self.lock = threading.Lock()
+
+        # per position: (name, check_types) - check_types None: not checked
+
+        self.positional: List[Tuple[str, Tuple[type, ...] | None]] = []
+        self.keyword: Dict[str, Tuple[type, ...] | None] = {}
+        self.var_positional: Tuple[type, ...] | None = None
+        self.var_keyword: Tuple[type, ...] | None = None
+        self.result: Tuple[type, ...] | None = None
+
+    # at the first call (forward references are defined by then) - only once, also if annotations can't be resolved
+    #  - not resolvable (e.g. imported only for TYPE_CHECKING) -> this parameter is not checked (one warning)
+
+    def compile(self) -> None:
+        func = inspect.unwrap(self.func)
+        globalns = getattr(func, "__globals__", {})
+        annotations = getattr(func, "__annotations__", {})
+
+        def resolve(name: str) -> Tuple[type, ...] | None:
+            if name not in annotations:
+                return None
+
+            holder = types.SimpleNamespace(__annotations__={name: annotations[name]})
+            try:
+                annotation = typing.get_type_hints(holder, globalns=globalns)[name]
+            except (NameError, AttributeError, TypeError, SyntaxError) as e:
+                Trace.warning(f"{self.name}: annotation '{name}' not checked - {e}")
+                return None
+
+            return get_check_types(annotation)
+
+        explicit = list(self.explicit_types)
+        for param in inspect.signature(func).parameters.values():
+            if param.kind is param.VAR_POSITIONAL:
+                self.var_positional = resolve(param.name)
+                continue
+
+            if param.kind is param.VAR_KEYWORD:
+                self.var_keyword = resolve(param.name)
+                continue
+
+            if explicit and param.kind is not param.KEYWORD_ONLY:
+                check_types = get_check_types(explicit.pop(0))
+            else:
+                check_types = resolve(param.name)
+
+            if param.kind is not param.KEYWORD_ONLY:
+                self.positional.append((param.name, check_types))
+            if param.kind is not param.POSITIONAL_ONLY:
+                self.keyword[param.name] = check_types
+
+        self.result = resolve("return")
+        self.compiled = True
+
+    def check_arguments(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        if not self.compiled:
+            with self.lock:
+                if not self.compiled:
+                    self.compile()
+
+        for (name, check_types), value in zip(self.positional, args, strict=False):
+            if check_types is not None and not isinstance(value, check_types):
+                self.error(f"argument '{name}'", check_types, value)
+
+        if self.var_positional is not None:
+            for value in args[len(self.positional):]:
+                if not isinstance(value, self.var_positional):
+                    self.error("argument '*args'", self.var_positional, value)
+
+        for name, value in kwargs.items():
+            check_types = self.keyword.get(name, self.var_keyword)
+            if check_types is not None and not isinstance(value, check_types):
+                self.error(f"argument '{name}'", check_types, value)
+
+    def check_result(self, result: Any) -> None:
+        if self.result is not None and not isinstance(result, self.result):
+            self.error("return value", self.result, result)
+
+    def error(self, text: str, check_types: Tuple[type, ...], value: Any) -> None:
+        expected = " | ".join(getattr(check_type, "__name__", str(check_type)) for check_type in check_types)
+        error = f"{self.name}: {text} - expected {expected}, but got {type(value).__name__}"
+        raise TypeError(error)
+
+# annotation -> tuple of types for isinstance() or None (not checkable)
+
+numeric_types: Dict[Any, Tuple[type, ...]] = {
+    float:   (float, int),
+    complex: (complex, float, int),
+}
+
+def get_check_types(annotation: Any) -> Tuple[type, ...] | None:
+    if annotation is Any or annotation is object:
+        return None
+
+    if annotation is None or annotation is type(None):
+        return (type(None),)
+
+    if annotation in numeric_types:
+        return numeric_types[annotation]
+
+    supertype = getattr(annotation, "__supertype__", None) # NewType
+    if supertype is not None:
+        return get_check_types(supertype)
+
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return get_check_types(typing.get_args(annotation)[0])
+
+    if origin is typing.Union or origin is types.UnionType:
+        members: List[type] = []
+        for arg in typing.get_args(annotation):
+            arg_types = get_check_types(arg)
+            if arg_types is None:
+                return None
+            members.extend(arg_types)
+        return tuple(dict.fromkeys(members))
+
+    if origin is not None:
+        annotation = origin # List[int] -> list, Callable[[int], str] -> collections.abc.Callable
+
+    if not isinstance(annotation, type):
+        return None # TypeVar, Literal, ...
+
+    try:
+        isinstance(None, annotation)
+    except TypeError:
+        return None # Protocol without @runtime_checkable, ...
+
+    return (annotation,)
 
 ###### decorator with ContextManager
 
 # https://www.youtube.com/watch?v=_QXlbwRmqgI&t=260s
 
 # BUT: arg, *kwarg not available
+#
+# with duration_cm("load"):
+#     ...
+#
+# benchmark: the same instance for warmup + rounds blocks -> statistics after the last block
+#
+# timer = duration_cm("parse", rounds=100, warmup=5, disable_gc=True)
+# for _ in range(105):
+#     with timer:
+#         ...
 
-@contextlib.contextmanager
-def duration_cm(name: str) -> Generator[None, None, None]:  # noqa: UP043
-    start_time = time.perf_counter()
-    try:
-        yield
-    finally:
-        end_time = time.perf_counter()
-        total_time = (end_time - start_time)
+#
+# aggregate: with duration_cm("parse", aggregate=True): ... -> duration.report()
+#
+# memory: with duration_cm("load", memory=True): ... -> peak (max of the blocks), net (sum of the blocks)
+#
+# as decorator (contextlib.ContextDecorator): the same instance for all calls -> rounds/warmup count the calls
+#
+# @duration_cm("parse", rounds=100)
+# def parse(): ...
+
+def duration_cm(name: str, *, rounds: int = 1, warmup: int = 0, disable_gc: bool = False, outliers: bool = False, aggregate: bool = False, memory: bool = False) -> DurationTimer:
+    return DurationTimer(name, rounds=rounds, warmup=warmup, disable_gc=disable_gc, outliers=outliers, aggregate=aggregate, memory=memory)
+
+class DurationTimer(contextlib.ContextDecorator):
+    def __init__(self, name: str, *, rounds: int = 1, warmup: int = 0, disable_gc: bool = False, outliers: bool = False, aggregate: bool = False, memory: bool = False) -> None:
+        self.name       = name
+        self.rounds     = max(1, rounds)
+        self.warmup     = warmup
+        self.disable_gc = disable_gc
+        self.outliers   = outliers
+        self.memory     = memory
+        self.stats      = get_duration_stats(name) if aggregate else None
+
+        self.times: List[float] = []
+        self.calls = 0
+        self.gc_enabled = False
+        self.start_time = 0.0
+
+        self.memory_state: Tuple[bool, int] | None = None
+        self.peak = 0
+        self.net  = 0
+
+    def __enter__(self) -> Self:
+        if self.disable_gc:
+            self.gc_enabled = gc.isenabled()
+            gc.disable()
+
+        if self.memory:
+            self.memory_state = memory_start()
+
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        total_time = time.perf_counter() - self.start_time
+
+        memory_usage = memory_stop(self.memory_state) if self.memory_state is not None else None
+        self.memory_state = None
+
+        if self.disable_gc and self.gc_enabled:
+            gc.enable()
+
+        self.calls += 1
+        if self.calls <= self.warmup:
+            return
+
+        if self.stats is not None:
+            self.stats.add([total_time], memory_usage)
+            return
+
+        self.times.append(total_time)
+        if memory_usage is not None:
+            self.peak = max(self.peak, memory_usage[0])
+            self.net += memory_usage[1]
+
+        if len(self.times) >= self.rounds:
+            trace_duration(self.name, self.times, self.warmup, self.outliers, (self.peak, self.net) if self.memory else None)
+            self.times = []
+            self.calls = 0
+            self.peak  = 0
+            self.net   = 0
+
+###### profiler (cProfile)
+
+# @profile
+# @profile("beautify '{1}'", top=3)
+# @profile(folder="./profile")                      -> "<name> • <time>.pstats" (snakeviz, python -m pstats)
+# @profile(folder="./profile", output="collapsed")  -> "<name> • <time>.collapsed.txt" (flamegraph.pl, speedscope)
+#
+# with profile_cm("excel import", folder="./profile"):
+#     ...
+#
+#  ooo  [profile] beautify_file: 1.486 sec - top: beautify (jsbeautifier.py:28) 0.734 sec, ...
+#
+# collapsed stacks are approximated from the call graph of cProfile (no sampling)
+# async def: not supported (other tasks would be profiled as well)
+
+profile_outputs = ["pstats", "collapsed"]
+
+def profile(
+    special: Callable[..., Any] | str | None = None,
+    *,
+    text: str | None = None,
+    top: int = 5,
+    folder: Path | str | None = None,
+    output: str = "pstats",
+) -> Callable[..., Any]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if isinstance(special, str): # text as arg
+            label = Label(func, special)
+
+        elif text is None:           # text as kwarg
+            label = Label(func, "{__name__}")
+        else:
+            label = Label(func, text)
+
+        @functools.wraps(wrapped=func)
+        def wrapper(*args: Tuple[Any, ...], **kwargs: Dict[str, Any]) -> Any:
+            with ProfileRunner(label.render(args, kwargs), top, folder, output):
+                return func(*args, **kwargs)
+        return wrapper
+
+    if isinstance(special, str) or special is None:
+        return decorator # @profile(...)
+
+    return decorator(func=special) # @profile
+
+def profile_cm(name: str, top: int = 5, folder: Path | str | None = None, output: str = "pstats") -> ProfileRunner:
+    return ProfileRunner(name, top, folder, output, block=True)
+
+# block=True (profile_cm): code directly in the with block is not a profiled function
+#  -> its time (total - self time of all functions) is reported as "<block>" (top, root of the collapsed stacks)
+
+class ProfileRunner:
+    def __init__(self, name: str, top: int, folder: Path | str | None, output: str, *, block: bool = False) -> None:
+        if output not in profile_outputs:
+            Trace.error(f"output '{output}' unknown -> {profile_outputs}")
+            output = "pstats"
+
+        self.name   = name
+        self.top    = top
+        self.folder = None if folder is None else Path(folder)
+        self.output = output
+        self.block  = block
+
+        self.profiler: cProfile.Profile | None = None
+        self.start_time = 0.0
+
+    def __enter__(self) -> Self:
+        self.start_time = time.perf_counter()
+
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError as e: # e.g. another profiler is active (nested @profile)
+            Trace.warning(f"profile '{self.name}': {e}")
+            self.profiler = None
+
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.disable()
+
+        total_time = time.perf_counter() - self.start_time
+        if profiler is None:
+            return
+
+        self.profiler = None
+
+        stats = pstats.Stats(profiler)
+        entries: Dict[Any, Any] = stats.stats  # type: ignore[attr-defined] # func -> (cc, nc, tt, ct, callers)
+
+        # without the profiler itself
+
+        exit_code = ProfileRunner.__exit__.__code__
+        entries.pop((exit_code.co_filename, exit_code.co_firstlineno, exit_code.co_name), None)
+        entries.pop(("~", 0, "<method 'disable' of '_lsprof.Profiler' objects>"), None)
+
+        block_time = max(0.0, total_time - sum(values[2] for values in entries.values())) if self.block else 0.0
+
+        times = [(get_profile_label(func), values[2]) for func, values in entries.items()]
+        if block_time > 0:
+            times.append(("<block>", block_time))
+
+        hottest = sorted(times, key=lambda item: item[1], reverse=True)[:self.top]
+        top_text = ", ".join(f"{label} {format_seconds(seconds)}" for label, seconds in hottest)
+
+        duration_text = f"{Color.GREEN}{Color.BOLD}{total_time:.3f} sec{Color.RESET}"
+        if top_text:
+            Trace.decorator(f"{self.name}: {duration_text} - top: {top_text}", path="profile")
+        else:
+            Trace.decorator(f"{self.name}: {duration_text}", path="profile")
+
+        if self.folder is not None:
+            self.save(stats, entries, block_time)
+
+    def save(self, stats: pstats.Stats, entries: Dict[Any, Any], block_time: float = 0.0) -> None:
+        filename = re.sub(r"[^\w\-. ]", "_", self.name) or "profile"
+
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)  # type: ignore[union-attr]
+
+            if self.output == "pstats":
+                file_path = self.folder / f"{filename} • {get_file_time()}.pstats"  # type: ignore[operator]
+                stats.dump_stats(file_path)
+            else:
+                stacks = get_collapsed_stacks(entries)
+                if self.block:
+                    stacks = {"<block>": block_time} | {f"<block>;{stack}": seconds for stack, seconds in stacks.items()}
+
+                lines = [f"{stack} {round(seconds * 1_000_000)}" for stack, seconds in stacks.items() if seconds >= 0.000_000_5]
+                if not lines:
+                    Trace.warning(f"profile '{self.name}': nothing profiled - no collapsed stacks")
+                    return
+
+                file_path = self.folder / f"{filename} • {get_file_time()}.collapsed.txt"  # type: ignore[operator]
+                file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        except OSError as e:
+            Trace.error(f"profile: {e}")
+
+# ("/path/utils/file.py", 413, "export_file") -> "export_file (file.py:413)"
+# ("~", 0, "<built-in method builtins.len>")   -> "<built-in method builtins.len>"
+
+def get_profile_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+# cProfile call graph -> collapsed stacks {"main;load;parse": seconds}
+#  - the self time of a function is split over its callers in proportion to the cumulative time per caller
+
+def get_collapsed_stacks(entries: Dict[Any, Any], max_depth: int = 64) -> Dict[str, float]:
+    callees: Dict[Any, List[Tuple[Any, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, caller_values in callers.items():
+            callees.setdefault(caller, []).append((func, caller_values[3]))
+
+    stacks: Dict[str, float] = {}
+
+    def walk(func: Any, path: List[str], active: List[Any], scale: float) -> None:
+        _cc, _nc, tt, _ct, _callers = entries[func]
+
+        stack = ";".join(path)
+        stacks[stack] = stacks.get(stack, 0.0) + tt * scale
+
+        if len(path) >= max_depth:
+            return
+
+        for callee, edge_time in callees.get(func, []):
+            callee_time = entries[callee][3]
+            if callee in active or callee_time <= 0 or edge_time * scale < 0.000_001:
+                continue
+
+            active.append(callee)
+            walk(callee, [*path, get_profile_label(callee)], active, scale * edge_time / callee_time)
+            active.pop()
+
+    for func, values in entries.items():
+        if not any(caller in entries for caller in values[4]): # root
+            walk(func, [get_profile_label(func)], [func], 1.0)
 
-        text = f"{Color.GREEN}{Color.BOLD}{total_time:.3f} sec{Color.RESET}"
-        Trace.decorator(f"{name}: {text}", path="duration")
+    return stacks
@@ -1,8 +1,11 @@
 """
-    © Jürgen Schoenemeyer, 26.06.2025 18:16
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
 
     src/utils/file.py
 
+    scan_folder, get_extension_matcher, write_file_data, encode_text, check_file_unchanged,
+    update_digest_index, save_digest_indexes, set_digest_index_path -> src/utils/file_io.py (re-exported)
+
     PUBLIC:
      # timestamp
      - get_modification_timestamp(filepath: Path | str) -> float
@@ -15,6 +18,10 @@
      # Listing
      - listdir(path: Path | str) -> Tuple[List[str], List[str]]
      - listdir_match_extention(path: Path | str, extensions: List[str] | None = None) -> Tuple[List[str], List[str]]
+     - scan_folder(path: Path | str, extensions: List[str] | None = None, skip_prefix: str | None = None) -> Tuple[List[str], List[str], List[str]]
+     - get_extension_matcher(extensions: List[str] | None) -> Callable[[str], bool] | None
+     - walk_files(root: Path | str, *, include: List[str | Pattern] | None = None, exclude: List[str | Pattern] | None = None, max_depth: int | None = None, follow_symlinks: bool = False, dirs: bool = False, workers: int = 0) -> Iterator[WalkEntry]
+     - get_pattern_matcher(patterns: List[str | Pattern] | None) -> Callable[[str, str], bool] | None
 
      # folder operations
      - list_folders(path: Path | str) -> List[str]:
@@ -35,10 +42,16 @@
      - import_json(folderpath: Path | str, filename: Path | str, show_error: bool=True) -> Any
      - import_json_timestamp(folderpath: Path | str, filename: Path | str, show_error: bool=True) -> Tuple[Any, float | None]
 
-     - export_text(folderpath: Path | str, filename: Path | str, text: str, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True) -> bool | None:
-     - export_json(folderpath: Path | str, filename: Path | str, data: Dict[str, Any] | List[Any], newline: str="\n", timestamp: float=0.0, show_message: bool=True) -> bool | None:
-     - export_binary_file(filepath: Path | str, filename: Path | str, data: bytes, _timestamp: float=0, create_new_folder: bool=False) -> bool | None
-     - export_file(filepath: Path|str, filename: Path | str, text: str, in_type: str | None = None, timestamp: float=0, create_new_folder: bool=True, encoding: str ="utf-8", newline: str="\n", overwrite: bool=True) -> None | str
+     - export_text(folderpath: Path | str, filename: Path | str, text: str, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> bool | None:
+     - export_json(folderpath: Path | str, filename: Path | str, data: Dict[str, Any] | List[Any], newline: str="\n", timestamp: float=0.0, show_message: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> bool | None:
+     - export_binary_file(filepath: Path | str, filename: Path | str, data: bytes, _timestamp: float=0, create_new_folder: bool=False, *, atomic: bool=False, fsync: bool=False) -> bool | None
+     - export_file(filepath: Path|str, filename: Path | str, text: str, in_type: str | None = None, timestamp: float=0, create_new_folder: bool=True, encoding: str ="utf-8", newline: str="\n", overwrite: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> None | str
+     - write_file_data(filepath: Path | str, data: str | bytes, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, *, atomic: bool=False, fsync: bool=False) -> None # OSError, TimestampError
+     - encode_text(text: str, encoding: str="utf-8", newline: str | None="\n") -> bytes
+     - check_file_unchanged(filepath: Path | str, data: bytes, *, digest_index: bool=False) -> bool | None # OSError
+     - update_digest_index(filepath: Path | str, data: bytes) -> None
+     - save_digest_indexes() -> None
+     - set_digest_index_path(path: Path | str) -> None
     #
      - get_filename_unique(folderpath: Path |, filename: Path | str) -> str
      - find_matching_file(filepath: Path | str) -> bool | str
@@ -47,6 +60,9 @@
      - get_file_infos(path: Path | str, filename: str, _in_type: str) -> None | Dict
     #
      - copy_my_file(source: str, dest: str, _show_updated: bool) -> bool
+     - get_file_digests(filepath: Path | str, algorithms: List[str] | None = None, buffer_size: int=1048576) -> Dict[str, str] | None
+     - get_file_digest(filepath: Path | str, algorithm: str="blake2b") -> str | None
+     - check_same_content(source: Path | str, dest: Path | str) -> bool
      - sanitize_filename(filename: str) -> str:
 
     PRIVATE:
@@ -55,19 +71,41 @@
 from __future__ import annotations
 
 import datetime
-import filecmp
+import fnmatch
 import hashlib
 import json
 import os
 import re
 import shutil
+import sys
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from re import Match
-from typing import Any, Dict, List, Tuple
-
+from re import Match, Pattern
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Set, Tuple
+
+try:
+    import xxhash
+except ModuleNotFoundError:
+    pass
+
+from utils.file_io import (  # noqa: F401 (re-export: public API of file.py)
+    TimestampError,
+    check_file_unchanged,
+    encode_text,
+    get_extension_matcher,
+    save_digest_indexes,
+    scan_folder,
+    set_digest_index_path,
+    update_digest_index,
+    write_file_data,
+)
 from utils.trace import Trace
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from concurrent.futures import Future
+
 # timestamp
 
 def get_modification_timestamp(filepath: Path | str) -> float:
@@ -125,6 +163,9 @@ def check_file_exists(filepath_start: Path | str, filepath_end: Path | str) -> b
         return False
 
 # folder Listing
+#
+# os.scandir: the file type is cached in the directory entry -> no extra stat() per entry
+# (important for network shares with large folders), only symlinks need a stat()
 
 def listdir(path: Path | str) -> Tuple[List[str], List[str]]:
     return listdir_match_extention(path, [".*"])
@@ -134,8 +175,6 @@ def listdir(path: Path | str) -> Tuple[List[str], List[str]]:
 def listdir_match_extention(path: Path | str, extensions: List[str]) -> Tuple[List[str], List[str]]:
     path = Path(path)
 
-    extensions = list({ext.lstrip(".") for ext in extensions})
-
     files:   List[str] = []
     folders: List[str] = []
 
@@ -143,38 +182,189 @@ def listdir_match_extention(path: Path | str, extensions: List[str]) -> Tuple[Li
         Trace.error(f"folder not found '{path.as_posix()}'")
         return files, folders
 
-    for file in os.listdir(path):
+    try:
+        files, folders, skipped = scan_folder(path, extensions, skip_prefix="~")
+    except OSError as e:
+        Trace.error(f"{e}")
+        return files, folders
+
+    for file in skipped:
         if file.startswith("~"):
             Trace.warning(f"skip temp file '{file}'")
-            continue
-
-        if (path / file).is_file():
-            for extention in extensions:
-                if extention == "*" or file.endswith("." + extention):
-                    files.append(file)
-                    break
-
-        elif (path / file).is_dir():
-            folders.append(file)
-
         else:
             Trace.warning(f"skip unknown filetype '{file}'")
 
     return files, folders
 
 def list_folders(path: Path | str) -> List[str]:
-    path = Path(path)
-
     folders: List[str] = []
     try:
-        for file in os.listdir(path):
-            if (path / file).is_dir():
-                folders.append(file)
+        _, folders, _ = scan_folder(path)
     except OSError as e:
         Trace.error(f"{e}")
 
     return folders
 
+# recursive listing (generator)
+#
+# for entry in walk_files("./data", include=["*.json"], exclude=["__pycache__", ".*"], max_depth=2):
+#     print(entry.relative, entry.size, entry.mtime)
+#
+#  - include: files only (name or relative path), exclude: files and folders -> excluded folders are not scanned at all
+#  - patterns: glob (without "/" -> name, with "/" -> relative path) or re.compile(...) -> search in the relative path
+#  - max_depth: None => unlimited, 0 => only the files in root
+#  - follow_symlinks: symlinked folders are scanned (loops are detected), otherwise symlinks are yielded as files (lstat)
+#  - dirs: also yield the folders (is_dir=True)
+#  - workers > 0: sibling folders are scanned concurrently (high-latency filesystems, e.g. network shares)
+#    -> the order of the entries is not deterministic
+
+class WalkEntry(NamedTuple):
+    path:     str   # root + relative
+    relative: str   # posix path relative to root
+    size:     int
+    mtime:    float
+    is_dir:   bool
+
+type WalkFolder = Tuple[str, str, int] # path, relative, depth
+
+def walk_files(
+    root:            Path | str,
+    *,
+    include:         List[str | Pattern[str]] | None = None,
+    exclude:         List[str | Pattern[str]] | None = None,
+    max_depth:       int | None = None,
+    follow_symlinks: bool = False,
+    dirs:            bool = False,
+    workers:         int = 0,
+) -> Iterator[WalkEntry]:
+
+    include_match = get_pattern_matcher(include)
+    exclude_match = get_pattern_matcher(exclude)
+
+    def scan(folder: WalkFolder) -> Tuple[List[WalkEntry], List[WalkFolder], List[Tuple[int, int]]]:
+        return _walk_scan(folder, include_match=include_match, exclude_match=exclude_match, max_depth=max_depth, follow_symlinks=follow_symlinks, dirs=dirs)
+
+    root = os.fspath(root)
+    visited: Set[Tuple[int, int]] = set()
+    if follow_symlinks:
+        try:
+            stat = Path(root).stat()
+            visited.add((stat.st_dev, stat.st_ino))
+        except OSError as e:
+            Trace.error(f"{e}")
+            return
+
+    # serial: depth first, lazy per folder
+
+    if workers <= 0:
+        stack: List[WalkFolder] = [(root, "", 0)]
+        while stack:
+            entries, folders, keys = scan(stack.pop())
+            yield from entries
+            stack.extend(reversed(_walk_unvisited(folders, keys, visited, follow_symlinks)))
+        return
+
+    # parallel: every folder is a task, entries are yielded as soon as a folder is scanned
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="walk_files")
+    try:
+        pending: Set[Future[Tuple[List[WalkEntry], List[WalkFolder], List[Tuple[int, int]]]]] = {executor.submit(scan, (root, "", 0))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, folders, keys = future.result()
+                for folder in _walk_unvisited(folders, keys, visited, follow_symlinks):
+                    pending.add(executor.submit(scan, folder))
+                yield from entries
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _walk_scan(
+    folder:          WalkFolder,
+    *,
+    include_match:   Callable[[str, str], bool] | None,
+    exclude_match:   Callable[[str, str], bool] | None,
+    max_depth:       int | None,
+    follow_symlinks: bool,
+    dirs:            bool,
+) -> Tuple[List[WalkEntry], List[WalkFolder], List[Tuple[int, int]]]:
+
+    path, relative, depth = folder
+    descend = max_depth is None or depth < max_depth
+
+    entries: List[WalkEntry] = []
+    folders: List[WalkFolder] = []
+    keys:    List[Tuple[int, int]] = [] # (st_dev, st_ino) of the folders -> symlink loops
+
+    try:
+        with os.scandir(path) as scan_entries:
+            for entry in scan_entries:
+                name = entry.name
+                entry_relative = relative + "/" + name if relative else name
+
+                if exclude_match is not None and exclude_match(name, entry_relative):
+                    continue
+
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if dirs or (descend and follow_symlinks):
+                            stat = entry.stat(follow_symlinks=follow_symlinks)
+                            if dirs:
+                                entries.append(WalkEntry(entry.path, entry_relative, stat.st_size, stat.st_mtime, True))
+
+                        if descend:
+                            folders.append((entry.path, entry_relative, depth + 1))
+                            if follow_symlinks:
+                                keys.append((stat.st_dev, stat.st_ino))
+
+                    elif include_match is None or include_match(name, entry_relative):
+                        stat = entry.stat(follow_symlinks=follow_symlinks)
+                        entries.append(WalkEntry(entry.path, entry_relative, stat.st_size, stat.st_mtime, False))
+
+                except OSError as e: # broken symlink, no permission, deleted in the meantime
+                    Trace.warning(f"{e}")
+
+    except OSError as e:
+        Trace.error(f"{e}")
+
+    return entries, folders, keys
+
+def _walk_unvisited(folders: List[WalkFolder], keys: List[Tuple[int, int]], visited: Set[Tuple[int, int]], follow_symlinks: bool) -> List[WalkFolder]:
+    if not follow_symlinks:
+        return folders
+
+    result: List[WalkFolder] = []
+    for folder, key in zip(folders, keys, strict=True):
+        if key in visited:
+            Trace.warning(f"symlink loop '{folder[0]}'")
+            continue
+        visited.add(key)
+        result.append(folder)
+
+    return result
+
+# glob/regex patterns -> match(name, relative) (compiled once, all globs in one regex)
+
+def get_pattern_matcher(patterns: List[str | Pattern[str]] | None) -> Callable[[str, str], bool] | None:
+    if not patterns:
+        return None
+
+    name_globs = [fnmatch.translate(pattern) for pattern in patterns if isinstance(pattern, str) and "/" not in pattern]
+    path_globs = [fnmatch.translate(pattern.strip("/")) for pattern in patterns if isinstance(pattern, str) and "/" in pattern]
+    regexes    = [pattern for pattern in patterns if not isinstance(pattern, str)]
+
+    name_regex = re.compile("|".join(name_globs)) if name_globs else None
+    path_regex = re.compile("|".join(path_globs)) if path_globs else None
+
+    def match(name: str, relative: str) -> bool:
+        if name_regex is not None and name_regex.match(name):
+            return True
+        if path_regex is not None and path_regex.match(relative):
+            return True
+        return any(regex.search(relative) for regex in regexes)
+
+    return match
+
 def clear_folder(path: Path | str) -> None:
     path = Path(path)
 
@@ -259,12 +449,10 @@ def get_trace_path(filepath: Path | str) -> str:
     return trace_path
 
 def get_files_in_folder(path: Path | str) -> List[str]:
-    path = Path(path)
-    return [f for f in os.listdir(path) if (path / f).is_file()]
+    return scan_folder(path)[0]
 
 def get_folders_in_folder(path: Path | str) -> List[str]:
-    path = Path(path)
-    return [f for f in os.listdir(path) if (path / f).is_dir()]
+    return scan_folder(path)[1]
 
 def get_save_filename(path: Path | str, stem: str, suffix: str) -> str:
     files: List[str] = get_files_in_folder(Path(path))
@@ -323,37 +511,37 @@ def import_json_timestamp(folderpath: Path | str, filename: Path | str, show_err
     else:
         return None, 0.0
 
-def export_text(folderpath: Path | str, filename: Path | str, text: str, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True) -> bool | None:
+def export_text(folderpath: Path | str, filename: Path | str, text: str, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> bool | None:
     filepath   = Path(folderpath) / filename
     folderpath = filepath.parent
     filename   = filepath.name
 
-    exist = False
+    data = encode_text(text, encoding, newline)
+
     try:
-        with filepath.open(mode="r", encoding=encoding) as f:
-            text_old = f.read()
-            exist = True
+        unchanged = check_file_unchanged(filepath, data, digest_index=digest_index)
     except OSError:
-        text_old = ""
+        unchanged = None
 
-    if exist:
-        if text == text_old:
-            if show_message:
-                Trace.info(f"not changed '{filepath}'")
-            return False
+    if unchanged:
+        if show_message:
+            Trace.info(f"not changed '{filepath}'")
+        return False
 
     if create_new_folder:
         create_folder(folderpath)
 
     try:
-        with filepath.open(mode="w", encoding=encoding, newline=newline) as f:
-            f.write(text)
+        try:
+            write_file_data(filepath, data, timestamp=timestamp, atomic=atomic, fsync=fsync)
+        except TimestampError as e:
+            Trace.error(f"{e}") # written, as set_modification_timestamp()
 
-        if timestamp != 0:
-            set_modification_timestamp(filepath, timestamp)
+        if digest_index:
+            update_digest_index(filepath, data)
 
         if show_message:
-            if text_old == "":
+            if unchanged is None:
                 Trace.update(f"created '{filepath}'")
             else:
                 Trace.update(f"changed '{filepath}'")
@@ -365,16 +553,16 @@ def export_text(folderpath: Path | str, filename: Path | str, text: str, encodin
         Trace.error(f"{msg} - {filepath}")
         return None
 
-def export_json(folderpath: Path | str, filename: Path | str, data: Any, newline: str="\n", timestamp: float=0.0, show_message: bool=True) -> bool | None:
+def export_json(folderpath: Path | str, filename: Path | str, data: Any, newline: str="\n", timestamp: float=0.0, show_message: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> bool | None:
     filepath   = Path(folderpath) / filename
     folderpath = filepath.parent
     filename   = filepath.name
 
     text = json.dumps(data, ensure_ascii=False, indent=2)
 
-    return export_text(folderpath, filename, text, encoding="utf-8", newline=newline, timestamp=timestamp, show_message=show_message)
+    return export_text(folderpath, filename, text, encoding="utf-8", newline=newline, timestamp=timestamp, show_message=show_message, atomic=atomic, fsync=fsync, digest_index=digest_index)
 
-def export_binary_file(folderpath: Path | str, filename: Path | str, data: bytes, _timestamp: float=0, create_new_folder: bool=False) -> bool | None:
+def export_binary_file(folderpath: Path | str, filename: Path | str, data: bytes, _timestamp: float=0, create_new_folder: bool=False, *, atomic: bool=False, fsync: bool=False) -> bool | None:
     filepath   = Path(folderpath) / filename
     folderpath = filepath.parent
     filename   = filepath.name
@@ -383,8 +571,7 @@ def export_binary_file(folderpath: Path | str, filename: Path | str, data: bytes
         create_folder(folderpath)
 
     try:
-        with (folderpath / filename).open(mode="wb") as f:
-            f.write(data)
+        write_file_data(folderpath / filename, data, atomic=atomic, fsync=fsync)
         return True
 
     except OSError as e:
@@ -392,7 +579,7 @@ def export_binary_file(folderpath: Path | str, filename: Path | str, data: bytes
         Trace.error(f"{msg} - {folderpath / filename}")
         return None
 
-def export_file(folderpath: Path | str, filename: str, text: str, in_type: str | None = None, encoding: str ="utf-8", newline: str="\n",timestamp: float=0.0, create_new_folder: bool=True, overwrite: bool=True) -> bool | None:
+def export_file(folderpath: Path | str, filename: str, text: str, in_type: str | None = None, encoding: str ="utf-8", newline: str="\n",timestamp: float=0.0, create_new_folder: bool=True, overwrite: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> bool | None:
     filepath   = Path(folderpath) / filename
     folderpath = filepath.parent
     filename   = filepath.name
@@ -421,13 +608,14 @@ def export_file(folderpath: Path | str, filename: str, text: str, in_type: str |
 
         my_filename = dest2 + copy + "." + ext
 
+    data = encode_text(text, encoding, newline)
+
     try:
-        with (folderpath / my_filename).open(mode="r", encoding=encoding) as f:
-            ref_text = f.read()
+        unchanged = check_file_unchanged(folderpath / my_filename, data, digest_index=digest_index)
     except OSError:
-        ref_text = ""
+        unchanged = None
 
-    if text == ref_text:
+    if unchanged:
         if in_type:
             Trace.info(f"'{in_type}' not changed '{trace_export_path}'")
         else:
@@ -440,18 +628,20 @@ def export_file(folderpath: Path | str, filename: str, text: str, in_type: str |
             create_folder(folderpath)
 
         try:
-            with (folderpath / my_filename).open(mode="w", encoding=encoding, newline=newline) as f:
-                f.write(text)
+            try:
+                write_file_data(folderpath / my_filename, data, timestamp=timestamp, atomic=atomic, fsync=fsync)
+            except TimestampError as e:
+                Trace.error(f"{e}") # written, as set_modification_timestamp()
 
-            if timestamp != 0:
-                set_modification_timestamp(folderpath / my_filename, timestamp)
+            if digest_index:
+                update_digest_index(folderpath / my_filename, data)
 
         except OSError as e:
             err = str(e).split(":")[0]
             Trace.error(f"{err} '{trace_export_path}'")
             return None
 
-        if ref_text == "":
+        if unchanged is None:
             if in_type:
                 Trace.update(f"'{in_type}' created '{trace_export_path}'")
             else:
@@ -464,7 +654,6 @@ def export_file(folderpath: Path | str, filename: str, text: str, in_type: str |
 
         return True
 
-
 # increment_filename(filename_stem: str) -> str:
 #
 # 'filaname'     -> 'filaname (1)'
@@ -545,8 +734,10 @@ def get_file_infos(folderpath: Path | str, filename: Path | str, _in_type: str)
     # filename   = filepath.name
 
     if filepath.is_file():
-        with filepath.open(mode="rb") as f:
-            md5 = hashlib.md5(f.read()).hexdigest()  # noqa: S324
+        digests = get_file_digests(filepath, ["md5"]) # streaming -> constant memory also for large media files
+        if digests is None:
+            return None
+        md5 = digests["md5"]
 
         size           = filepath.stat().st_size
         timestamp      = get_modification_timestamp(filepath)
@@ -575,7 +766,7 @@ def copy_my_file(source: Path | str, dest: Path | str, _show_updated: bool) -> b
 
     new_timestamp = get_modification_timestamp(source)
 
-    if not dest.exists() or not filecmp.cmp(source, dest):
+    if not dest.exists() or not check_same_content(source, dest):
         try:
             shutil.copyfile(source, dest)
             set_modification_timestamp(dest, timestamp=new_timestamp)
@@ -587,6 +778,88 @@ def copy_my_file(source: Path | str, dest: Path | str, _show_updated: bool) -> b
 
     return True
 
+# same content:
+#  - size differs -> False
+#  - size and mtime equal -> True (as filecmp.cmp shallow, copy_my_file sets the mtime of the copy)
+#  - otherwise: streaming digests of both files (xxh3_128 if xxhash is installed, else blake2b)
+
+def check_same_content(source: Path | str, dest: Path | str) -> bool:
+    try:
+        source_stat = Path(source).stat()
+        dest_stat   = Path(dest).stat()
+    except OSError:
+        return False
+
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+
+    if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+
+    algorithm = "xxh3_128" if "xxhash" in sys.modules else "blake2b"
+
+    source_digest = get_file_digest(source, algorithm)
+    return source_digest is not None and source_digest == get_file_digest(dest, algorithm)
+
+# streaming file hashing (bounded buffer -> constant memory also for multi-GB files)
+#
+# get_file_digests("video.mp4", ["md5", "sha256", "blake2b"]) -> {"md5": "...", "sha256": "...", "blake2b": "..."} (one pass)
+# get_file_digest("video.mp4", "xxh3_64") -> "..."
+#
+#  - hashlib: "md5", "sha1", "sha256", "blake2b", "blake2s", ... (hashlib.algorithms_available)
+#  - xxhash (if installed): "xxh32", "xxh64", "xxh3_64", "xxh3_128", "xxh128" - not cryptographic, but much faster
+#  - one hashlib algorithm -> hashlib.file_digest(), otherwise readinto() a reused buffer + update() of all hashes
+
+def get_file_digests(filepath: Path | str, algorithms: List[str] | None = None, buffer_size: int=1024 * 1024) -> Dict[str, str] | None:
+    filepath = Path(filepath)
+
+    if algorithms is None:
+        algorithms = ["md5"]
+
+    hashes: Dict[str, Any] = {}
+    for algorithm in algorithms:
+        if algorithm.startswith("xxh"):
+            if "xxhash" not in sys.modules:
+                Trace.error(f"'{algorithm}': module 'xxhash' not installed")
+                return None
+
+            factory = getattr(xxhash, algorithm, None) # type: ignore[reportPossiblyUnboundVariable] # PyRight: "xxhash" is possibly unbound
+            if factory is None:
+                Trace.error(f"'{algorithm}' not supported")
+                return None
+            hashes[algorithm] = factory()
+
+        else:
+            try:
+                hashes[algorithm] = hashlib.new(algorithm, usedforsecurity=False)
+            except ValueError:
+                Trace.error(f"'{algorithm}' not supported")
+                return None
+
+    try:
+        with filepath.open(mode="rb") as f:
+            if len(hashes) == 1 and not algorithms[0].startswith("xxh"):
+                return {algorithms[0]: hashlib.file_digest(f, lambda: hashes[algorithms[0]]).hexdigest()}
+
+            buffer = bytearray(buffer_size)
+            view   = memoryview(buffer)
+            while size := f.readinto(buffer):
+                for hash_object in hashes.values():
+                    hash_object.update(view[:size])
+
+    except OSError as e:
+        Trace.error(f"{e}")
+        return None
+
+    return {algorithm: hash_object.hexdigest() for algorithm, hash_object in hashes.items()}
+
+def get_file_digest(filepath: Path | str, algorithm: str="blake2b") -> str | None:
+    digests = get_file_digests(filepath, [algorithm])
+    if digests is None:
+        return None
+
+    return digests[algorithm]
+
 def sanitize_filename(filename: str) -> str:
     forbidden_chars = r'[<>:"/\\|?*]'
 
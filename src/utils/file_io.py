@@ -0,0 +1,298 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
+
+    src/utils/file_io.py
+
+    low level file functions, shared by file.py and files.py (no rustedpy/result dependency)
+
+    PUBLIC:
+     # Listing
+     - scan_folder(path: Path | str, extensions: List[str] | None = None, skip_prefix: str | None = None) -> Tuple[List[str], List[str], List[str]]
+     - get_extension_matcher(extensions: List[str] | None) -> Callable[[str], bool] | None
+
+     # write
+     - write_file_data(filepath: Path | str, data: str | bytes, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, *, atomic: bool=False, fsync: bool=False) -> None # OSError, TimestampError
+     - encode_text(text: str, encoding: str="utf-8", newline: str | None="\n") -> bytes
+     - check_file_unchanged(filepath: Path | str, data: bytes, *, digest_index: bool=False) -> bool | None # OSError
+
+     # digest index
+     - get_data_digest(data: bytes) -> str
+     - update_digest_index(filepath: Path | str, data: bytes) -> None
+     - save_digest_indexes() -> None
+     - set_digest_index_path(path: Path | str) -> None # default: %LOCALAPPDATA%, $XDG_CACHE_HOME or ~/.cache + "/utils/digest_index"
+
+    PRIVATE:
+     - _write_data(f: Any, data: str | bytes, fsync: bool) -> None
+     - _get_digest_index(folderpath: Path) -> Dict[str, List[Any]]
+     - _get_digest_index_file(folderpath: Path) -> Path
+     - _get_digest_entry(filepath: Path) -> List[Any] | None
+     - _set_digest_entry(filepath: Path, stat: os.stat_result, digest: str) -> None
+"""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple
+
+from utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# files (matching the extensions), folders, skipped (skip_prefix or neither file nor folder)
+#  - extensions: [".zip", "story", ...], None or ".*" => all files
+#  - OSError is passed to the caller
+
+def scan_folder(path: Path | str, extensions: List[str] | None = None, skip_prefix: str | None = None) -> Tuple[List[str], List[str], List[str]]:
+    match = get_extension_matcher(extensions)
+
+    files:   List[str] = []
+    folders: List[str] = []
+    skipped: List[str] = []
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            name = entry.name
+
+            if skip_prefix and name.startswith(skip_prefix):
+                skipped.append(name)
+
+            elif entry.is_file():
+                if match is None or match(name):
+                    files.append(name)
+
+            elif entry.is_dir():
+                folders.append(name)
+
+            else:
+                skipped.append(name)
+
+    return files, folders, skipped
+
+# extensions -> precomputed suffix set (one lookup per name instead of a loop over all extensions)
+#  - multi part extensions (".tar.gz") -> str.endswith(tuple)
+
+def get_extension_matcher(extensions: List[str] | None) -> Callable[[str], bool] | None:
+    if extensions is None:
+        return None
+
+    suffixes = {"." + ext.lstrip(".") for ext in extensions}
+    if ".*" in suffixes:
+        return None
+
+    if any(suffix.count(".") > 1 for suffix in suffixes):
+        suffix_tuple = tuple(suffixes)
+        return lambda name: name.endswith(suffix_tuple)
+
+    return lambda name: name[name.rfind("."):] in suffixes
+
+# write text (str) or binary (bytes) data -> OSError to the caller
+#  - TimestampError (OSError): the data is written, only the timestamp could not be set
+#
+# atomic=True: temp file in the same folder -> (fsync) -> Path.replace() (os.replace)
+#  - the target is either the old or the new file, never a truncated one (crash, kill, concurrent writers)
+#  - timestamp is set on the temp file -> the new file appears with the final modification time
+#  - the permissions of an existing file are kept
+#
+# fsync=True: data on the disk before return (atomic: also the folder entry, POSIX only)
+
+class TimestampError(OSError):
+    pass
+
+def write_file_data(filepath: Path | str, data: str | bytes, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, *, atomic: bool=False, fsync: bool=False) -> None:
+    filepath = Path(filepath)
+
+    if not atomic:
+        if isinstance(data, bytes):
+            with filepath.open(mode="wb") as f:
+                _write_data(f, data, fsync)
+        else:
+            with filepath.open(mode="w", encoding=encoding, newline=newline) as f:
+                _write_data(f, data, fsync)
+
+        if timestamp != 0:
+            try:
+                os.utime(filepath, (timestamp, timestamp)) # atime and mtime
+            except OSError as e:
+                raise TimestampError(e) from e
+        return
+
+    tmp_path = filepath.with_name(f".{filepath.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666) # umask as for open()
+        if isinstance(data, bytes):
+            with os.fdopen(fd, mode="wb") as f:
+                _write_data(f, data, fsync)
+        else:
+            with os.fdopen(fd, mode="w", encoding=encoding, newline=newline) as f:
+                _write_data(f, data, fsync)
+
+        if filepath.exists():
+            with contextlib.suppress(OSError):
+                shutil.copymode(filepath, tmp_path)
+
+        timestamp_error: OSError | None = None
+        if timestamp != 0:
+            try:
+                os.utime(tmp_path, (timestamp, timestamp))
+            except OSError as e:
+                timestamp_error = e
+
+        tmp_path.replace(filepath)
+
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink()
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        fd = os.open(filepath.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    if timestamp_error is not None:
+        raise TimestampError(timestamp_error) from timestamp_error
+
+def _write_data(f: Any, data: str | bytes, fsync: bool) -> None:
+    f.write(data)
+    if fsync:
+        f.flush()
+        os.fsync(f.fileno())
+
+# text -> bytes as written by open(mode="w", encoding=encoding, newline=newline)
+
+def encode_text(text: str, encoding: str="utf-8", newline: str | None="\n") -> bytes:
+    if newline is None:
+        newline = os.linesep
+
+    if newline not in ["", "\n"]:
+        text = text.replace("\n", newline)
+
+    return text.encode(encoding)
+
+# unchanged check without reading the whole file into memory
+#  1. size (stat) differs -> changed
+#  2. digest_index=True: size + mtime_ns match the digest index -> digest compare (file is not read at all)
+#  3. chunked compare with the new content (stops at the first difference)
+#
+#  -> True: unchanged, False: changed, None: file does not exist (other errors: OSError)
+
+compare_chunk_size = 1024 * 1024
+
+def check_file_unchanged(filepath: Path | str, data: bytes, *, digest_index: bool=False) -> bool | None:
+    filepath = Path(filepath)
+
+    try:
+        stat = filepath.stat()
+    except FileNotFoundError:
+        return None
+
+    if stat.st_size != len(data):
+        return False
+
+    if digest_index:
+        entry = _get_digest_entry(filepath)
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2] == get_data_digest(data)
+
+    view = memoryview(data)
+    with filepath.open(mode="rb") as f:
+        pos = 0
+        while chunk := f.read(compare_chunk_size):
+            if view[pos:pos + len(chunk)] != chunk:
+                return False
+            pos += len(chunk)
+
+    if digest_index: # unchanged file, not yet in the index
+        _set_digest_entry(filepath, stat, get_data_digest(data))
+
+    return True
+
+# digest index: one file per output folder in a central cache folder (not in the output folder -> no extra data file)
+#  "<cache>/<folder name> • <blake2b of the absolute folder path>.json" -> {filename: [size, mtime_ns, blake2b]}
+#  - cache: %LOCALAPPDATA%, $XDG_CACHE_HOME or ~/.cache + "/utils/digest_index" (set_digest_index_path())
+#  - kept in memory, saved at exit (or save_digest_indexes())
+#  - entries of files changed by other programs are ignored (size/mtime_ns differ) -> chunked compare
+
+digest_index_path = Path(os.getenv("LOCALAPPDATA") or os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "utils" / "digest_index"
+
+digest_indexes: Dict[Path, Dict[str, List[Any]]] = {}
+digest_changed: Set[Path] = set()
+digest_lock = threading.Lock()
+digest_registered = False
+
+def set_digest_index_path(path: Path | str) -> None:
+    global digest_index_path  # noqa: PLW0603
+
+    save_digest_indexes()
+    with digest_lock:
+        digest_index_path = Path(path)
+        digest_indexes.clear()
+
+def get_data_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def update_digest_index(filepath: Path | str, data: bytes) -> None:
+    filepath = Path(filepath)
+
+    try:
+        stat = filepath.stat()
+    except OSError as e:
+        Trace.error(f"{e}")
+        return
+
+    _set_digest_entry(filepath, stat, get_data_digest(data))
+
+def save_digest_indexes() -> None:
+    with digest_lock:
+        for folderpath in digest_changed:
+            text = json.dumps(digest_indexes[folderpath], ensure_ascii=False, separators=(",", ":"))
+            try:
+                digest_index_path.mkdir(parents=True, exist_ok=True)
+                write_file_data(_get_digest_index_file(folderpath), text, atomic=True)
+            except OSError as e:
+                Trace.error(f"{e}")
+        digest_changed.clear()
+
+def _get_digest_index(folderpath: Path) -> Dict[str, List[Any]]:
+    global digest_registered  # noqa: PLW0603
+
+    index = digest_indexes.get(folderpath)
+    if index is None:
+        try:
+            with _get_digest_index_file(folderpath).open(mode="r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        digest_indexes[folderpath] = index
+
+        if not digest_registered:
+            atexit.register(save_digest_indexes)
+            digest_registered = True
+
+    return index
+
+def _get_digest_index_file(folderpath: Path) -> Path:
+    key = hashlib.blake2b(str(folderpath).encode("utf-8"), digest_size=16).hexdigest()
+    return digest_index_path / f"{folderpath.name} • {key}.json"
+
+def _get_digest_entry(filepath: Path) -> List[Any] | None:
+    with digest_lock:
+        return _get_digest_index(filepath.absolute().parent).get(filepath.name)
+
+def _set_digest_entry(filepath: Path, stat: os.stat_result, digest: str) -> None:
+    folderpath = filepath.absolute().parent
+    with digest_lock:
+        _get_digest_index(folderpath)[filepath.name] = [stat.st_size, stat.st_mtime_ns, digest]
+        digest_changed.add(folderpath)
@@ -1,9 +1,10 @@
 """
-    © Jürgen Schoenemeyer, 07.04.2025 20:30
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
 
     src/utils/files.py
 
     error channel -> rustedpy/result
+    needs src/utils/file_io.py (mandatory lib)
 
     PUBLIC:
      - result = get_timestamp(filepath: Path | str) -> Result[float, str]
@@ -12,7 +13,7 @@
      - result = get_files_dirs(path: str, extensions: List) -> Result[Tuple[List[str], List[str]], str]
 
      - result = read_file(filepath: Path | str, encoding: str="utf-8") -> Result[Any, str]
-     - result = write_file(filepath: Path | str, data: Any, encoding: str="utf-8", create_dir: bool = True, show_message: bool=True) -> Result[str, str]
+     - result = write_file(filepath: Path | str, data: Any, encoding: str="utf-8", create_dir: bool = True, show_message: bool=True, *, atomic: bool=False, fsync: bool=False, digest_index: bool=False) -> Result[str, str]
 
     ------
     from result import is_err, is_ok
@@ -59,6 +60,7 @@
 except ModuleNotFoundError:
     pass
 
+from utils.file_io import TimestampError, check_file_unchanged, encode_text, scan_folder, update_digest_index, write_file_data
 from utils.trace import Color, Trace
 
 TIMESTAMP = "%Y-%m-%d_%H-%M-%S"
@@ -118,30 +120,16 @@ def set_timestamp(filepath: Path | str, timestamp: float) -> Result[str, str]:
 
     return Ok("")
 
-# dir listing -> list of files and dirs
+# dir listing -> list of files (matching the extensions) and dirs (everything which is not a file)
 
 def get_files_dirs(path: Path | str, extensions: List[str]) -> Result[Tuple[List[str], List[str]], str]:
-    path = Path(path)
-
-    files: List[str] = []
-    dirs: List[str] = []
     try:
-        for filename in os.listdir(path):
-            filepath = path / filename
-
-            if filepath.is_file():
-                for extention in extensions:
-                    if "." + extention in filename:
-                        files.append(filename)
-                        break
-            else:
-                dirs.append(filename)
-
+        files, dirs, others = scan_folder(path, extensions)
     except OSError as e:
         Trace.error(f"{e}")
         return Err(f"{e}")
 
-    return Ok((files, dirs))
+    return Ok((files, dirs + others))
 
 def read_file(filepath: Path | str, encoding: str="utf-8") -> Result[Any, str]:
     """
@@ -240,7 +228,7 @@ def read_file(filepath: Path | str, encoding: str="utf-8") -> Result[Any, str]:
         return Err(f"Type '{file_type}' is not supported")
 
 
-def write_file(filepath: Path | str, data: Any, filename_timestamp: bool = False, timestamp: float = 0, encoding: str="utf-8", newline: str="\n", create_dir: bool = True, show_message: bool=True) -> Result[str, str]:
+def write_file(filepath: Path | str, data: Any, filename_timestamp: bool = False, timestamp: float = 0, encoding: str="utf-8", newline: str="\n", create_dir: bool = True, show_message: bool=True, *, atomic: bool = False, fsync: bool = False, digest_index: bool = False) -> Result[str, str]:
     """
     ### write file (text, json, xml)
 
@@ -251,6 +239,9 @@ def write_file(filepath: Path | str, data: Any, filename_timestamp: bool = False
      - encoding: str - used only for '.txt'
      - newline: str - "\\n" or "\\r\\n"
      - create_dir: bool - create directory if not exists (default: True)
+     - atomic: bool - temp file in the same directory + os.replace (never a truncated file)
+     - fsync: bool - data on the disk before return
+     - digest_index: bool - digest index in a central cache folder (size, mtime, digest) -> unchanged files are not read
 
     #### Returns [rustedpy]
      - Ok: -
@@ -385,48 +376,43 @@ def serialize_sets(obj: Any) -> Any:
         else:
             return Err(f"DirNotFoundError: '{dirpath}'")
 
-    # 3. file check
+    # 3. file check (size -> digest index -> chunked compare)
 
-    if filepath.exists():
-        try:
-            with filepath.open(mode="r", encoding=encoding) as f:
-                text_old = f.read()
-        except OSError as e:
-            Trace.debug(f"{e}")
-            return Err(f"{e}")
+    content = encode_text(text, encoding, newline)
 
-        if text == text_old:
-            Trace.info(f"'{filepath}' not modified")
-            return Ok("")
+    try:
+        unchanged = check_file_unchanged(filepath, content, digest_index=digest_index)
+    except OSError as e:
+        Trace.debug(f"{e}")
+        return Err(f"{e}")
 
-        try:
-            with filepath.open(mode="w", encoding=encoding, newline=newline) as f:
-                f.write(text)
-        except OSError as e:
-            return Err(f"{e}")
+    if unchanged:
+        Trace.info(f"'{filepath}' not modified")
+        return Ok("")
 
-        if show_message:
-            Trace.update(f"'{filepath}' updated")
+    # 4. write (optional: timestamp -> atime and mtime)
 
-    else:
-        try:
-            with filepath.open(mode="w", encoding=encoding, newline=newline) as f:
-                f.write(text)
-        except OSError as e:
-            Trace.debug(f"{e}")
-            return Err(f"{e}")
+    timestamp_error: TimestampError | None = None
+    try:
+        write_file_data(filepath, content, timestamp=max(timestamp, 0), atomic=atomic, fsync=fsync)
+    except TimestampError as e:
+        timestamp_error = e # written
+    except OSError as e:
+        Trace.debug(f"{e}")
+        return Err(f"{e}")
+
+    if digest_index:
+        update_digest_index(filepath, content)
 
-        if show_message:
+    if show_message:
+        if unchanged is None:
             Trace.update(f"'{filepath}' created")
+        else:
+            Trace.update(f"'{filepath}' updated")
 
-    # 4: optional: set file timestamp
-
-    if timestamp > 0:
-        try:
-            os.utime(filepath, times = (timestamp, timestamp)) # atime and mtime
-        except OSError as e:
-            Trace.debug(f"{e}")
-            return Err(f"timestamp: {e}")
+    if timestamp_error is not None:
+        Trace.debug(f"{timestamp_error}")
+        return Err(f"timestamp: {timestamp_error}")
 
     return Ok("")
 
@@ -449,14 +435,13 @@ def listdir_ext(dirpath: Path | str, extensions: List[str] | None = None) -> Res
         Trace.debug(err)
         return Err(err)
 
-    ret: List[str] = []
-    files = os.listdir(dirpath)
-    for file in files:
-        if (dirpath / file).is_file():
-            if extensions is None or Path(dirpath, file).suffix in extensions:
-                ret.append(file)
+    try:
+        files, _, _ = scan_folder(dirpath, extensions)
+    except OSError as e:
+        Trace.debug(f"{e}")
+        return Err(f"{e}")
 
-    return Ok(ret)
+    return Ok(files)
 
 def check_path_exist(path: Path | str, case_sensitive: bool=False, debug: bool=False) -> Result[str, str]:
     if str(path)[-1] == ":":
@@ -1,5 +1,5 @@
 """
-    © Jürgen Schoenemeyer, 07.04.2025 20:30
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
 
     src/utils/trace.py
 
@@ -11,6 +11,11 @@
       - Trace.set(timezone="Europe/Berlin") # "UTC", "America/New_York"
       - Trace.set(show_caller=False)
       - Trace.set(appl_folder="/trace/")
+      - Trace.set(format="jsonl")     # one json record per line (orjson if installed)
+      - Trace.set(dedup_window=5.0)  # identical messages within 5 sec -> one line + "repeated N times"
+      - Trace.set(rate_limit=10, rate_burst=20) # token bucket per call site
+      - Trace.set(async_output=True)   # writer thread, bounded queue (forked child: synchronous)
+      - Trace.set(async_queue_size=10_000, async_flush_interval=0.1, async_policy="block") # "drop_oldest", "drop"
 
       - Trace.action()
       - Trace.result()
@@ -26,10 +31,41 @@
 
       - Trace.decorator()
 
+      - Trace.info("'%s' loaded: %.3f sec", args=(filename, duration)) # lazy: formatted only if shown
+      - Trace.debug(lambda: f"{data}")                                 # lazy: called only if shown
+      - Trace.is_enabled("debug") -> bool
+
       - Trace.file_init(["action", "result", "warning", "error"], csv=False)
       - Trace.file_save("./logs", "testTrace")
 
-      - Trace.redirect(function) # -> e.g. qDebug (PySide6)
+      - Trace.file_init(["action", "result", "warning", "error"], path="./logs", filename="testTrace") # streaming
+      - Trace.file_init([...], path="./logs", filename="testTrace", max_bytes=10_000_000, max_seconds=3600, compress=True, max_files=10)
+      - Trace.file_save() # streaming: close file
+
+      - Trace.crash_init("./logs", "crash", size=1000) # last 1000 messages (all levels) -> file on fatal, exception, unhandled exception
+      - Trace.crash_dump(reason) -> Path | None
+
+      - Trace.redirect(function) # -> e.g. qDebug (PySide6), Trace.redirect(None) -> stdout
+
+      - Trace.add_sink("gui", function, level="warning")                       # several sinks at the same time
+      - Trace.add_sink("errors", FileWriter(Path("./logs"), "errors"), formatter="jsonl")
+      - Trace.add_sink("last", RingBufferSink(1000), levels=["warning", "error"])
+      - Trace.remove_sink("gui")
+      - Trace.get_sink("last") -> TraceSink | None
+
+      - Trace.context("worker 1")   # with ...: message prefix for the current thread
+      - Trace.enable_multiprocess() # -> queue: messages of child processes are written by the parent process
+      - Trace.attach_multiprocess(queue) # spawn: Pool(initializer=Trace.attach_multiprocess, initargs=(queue,))
+
+      - Trace.flush()   # async_output: wait until all messages are written
+      - Trace.dropped() # async_output: number of dropped messages
+
+    sinks -> Trace.add_sink():
+      - StdoutSink()
+      - CallableSink(function)
+      - MemorySink(messages, csv=False)
+      - RingBufferSink(size, csv=False).lines()
+      - FileWriter(path, filename, *, max_bytes=0, max_seconds=0, compress=False, csv=False, max_files=0)
 
     static class Color:
       - Color.<color_name>
@@ -37,20 +73,36 @@
 """
 from __future__ import annotations
 
+import atexit
+import contextlib
+import functools
+import gzip
 import importlib.util
-import inspect
+import multiprocessing
+import os
 import platform
 import re
+import shutil
 import sys
+import threading
+import time
+import traceback
 
+from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Deque, Dict, Generator, List, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    import json
+
 if TYPE_CHECKING:
-    from types import FrameType
+    from types import CodeType
 
 # https://en.wikipedia.org/wiki/ANSI_escape_code#Colors
 
@@ -103,7 +155,11 @@ class Color(StrEnum):
 
     @staticmethod
     def clear(text: str) -> str:
-        return re.sub(r"\033\[[0-9;]*m", "", text)
+        if "\033" not in text:
+            return text
+        return ansi_escape.sub("", text)
+
+ansi_escape = re.compile(r"\033\[[0-9;]*m")
 
 pattern: Dict[str, str] = {
     "time":      " --> ",
@@ -127,6 +183,99 @@ def clear(text: str) -> str:
     "unknown":   " ??? ",
 }
 
+async_policies: List[str] = ["block", "drop_oldest", "drop"]
+
+trace_formats: List[str] = ["text", "jsonl"]
+
+# minimum level per sink -> Trace.add_sink(..., level="warning")
+
+trace_levels: Dict[str, int] = {
+    "debug":     10,
+    "wait":      10,
+    "info":      20,
+    "update":    20,
+    "download":  20,
+    "decorator": 20,
+    "action":    30,
+    "result":    30,
+    "important": 30,
+    "warning":   40,
+    "error":     50,
+    "exception": 50,
+    "fatal":     60,
+}
+
+# (second, timezone, "13:26:14", "+0100", "2025-04-07T13:26:14", "+01:00")
+
+type TimeCache = Tuple[int, bool | str, str, str, str, str]
+
+# never deduplicated or rate limited
+
+unfiltered_types: List[str] = ["fatal", "wait"]
+
+# not in reduced mode
+
+reduced_types: List[str] = ["info", "update", "download", "debug"]
+
+# jsonl -> orjson (if installed) or json
+
+def dumps_json(record: Dict[str, Any]) -> str:
+    if "orjson" in sys.modules:
+        return orjson.dumps(record, default=str).decode("utf-8")  # type: ignore[reportPossiblyUnboundVariable] # PyRight: "orjson" is possibly unbound
+
+    return json.dumps(record, default=str, ensure_ascii=False, separators=(",", ":")) # type: ignore[reportPossiblyUnboundVariable] # PyRight: "json" is possibly unbound
+
+# ZoneInfo per timezone name
+
+@functools.cache
+def get_zoneinfo(tz: str) -> ZoneInfo:
+    return ZoneInfo(tz)
+
+# record: (time_ns, trace_type, path, line_no, caller, message, optional)
+
+type TraceRecord = Tuple[int, str, str, int, str, str, Tuple[Any, ...]]
+
+# sink formatter: "text" (color, plain or csv -> depends on the sink), "jsonl" or function(record) -> str
+
+type Formatter = str | Callable[[TraceRecord], str]
+
+# routes: trace_type -> (formats, ((name, sink, format), ...))
+
+type Route = Tuple[Tuple[Any, ...], Tuple[Tuple[str, TraceSink, Any], ...]]
+
+# crash buffer entry: TraceRecord (shown messages) or
+#   (time_ns, trace_type, code, line_no, "", message, optional, args) -> suppressed messages, formatted only by crash_dump()
+
+type CrashEntry = Tuple[Any, ...]
+
+# multiprocess: optional values which are not json types -> str
+
+def get_picklable_record(record: TraceRecord) -> TraceRecord:
+    optional = tuple(opt if isinstance(opt, (str, int, float, bool, type(None))) else str(opt) for opt in record[6])
+    return (*record[:6], optional)
+
+# per-thread context names -> Trace.context()
+
+thread_context = threading.local()
+
+# lazy messages -> formatted only if the message is shown
+#  - Trace.info("'%s' loaded: %.3f sec", args=(filename, duration))
+#  - Trace.debug(lambda: f"{data}")
+
+type Message = str | Callable[[], Any]
+
+def get_message(message: Message, args: Tuple[Any, ...] | None) -> str:
+    if callable(message):
+        return str(message())
+
+    if args:
+        try:
+            return message % args
+        except (TypeError, ValueError, KeyError):
+            return message + "".join(" > " + str(arg) for arg in args)
+
+    return message
+
 class Trace:
     BASE_PATH: Path = Path(sys.argv[0]).parent
 
@@ -144,20 +293,97 @@ class Trace:
         "timezone":       True,
 
         "show_caller":    True,
+
+        "format":         "text", # "text", "jsonl"
+
+        "dedup_window":   0.0,   # sec, 0: off
+        "rate_limit":     0.0,   # messages/sec per call site, 0: off
+        "rate_burst":     10,
+
+        "async_output":         False,
+        "async_queue_size":     10_000,
+        "async_flush_interval": 0.1,     # sec
+        "async_policy":         "block", # "block", "drop_oldest", "drop"
     }
 
+    # pattern (+ color) per trace method -> precomputed at class creation
+
+    trace_pattern: ClassVar[Dict[str, str]] = {
+        **pattern,
+        "important": f"{Color.MAGENTA}{pattern['important']}",
+        "error":     f"{Color.RED}{pattern['error']}",
+        "exception": f"{Color.RED}{pattern['exception']}",
+        "fatal":     f"{Color.RED}{Color.BOLD}{pattern['fatal']}",
+    }
+
+    # code object -> path relative to appl_folder
+
+    caller_cache: ClassVar[Dict[CodeType, str]] = {}
+
+    # (second, timezone, "13:26:14", "+0100", "2025-04-07T13:26:14", "+01:00")
+
+    time_cache: TimeCache = (-1, False, "", "", "", "")
+
     pattern:  ClassVar[List[str]] = []
     messages: ClassVar[List[str]] = []
     csv: bool = False
-    output: Callable[..., None] | None = None
+    async_writer: AsyncWriter | None = None
+    async_registered: bool = False
+
+    # sinks: name -> (sink, minimum level, levels or None, formatter)
+    # routes: trace_type -> sinks (precomputed by add_sink, remove_sink, set)
+
+    sinks:  ClassVar[Dict[str, Tuple[TraceSink, int, frozenset[str] | None, Formatter]]] = {}
+    routes: ClassVar[Dict[str, Route]] = {}
+    sinks_registered: bool = False
+
+    # output of all threads is serialized, child processes -> mp_queue -> parent process
+
+    lock: threading.RLock = threading.RLock()
+
+    # stdout with colors -> checked at start and by Trace.set()
+
+    stdout_color: bool = True
+
+    # dedup_window, rate_limit
+
+    filter_active: bool = False
+    filter_lock: threading.Lock = threading.Lock()
+    filter_registered: bool = False
+    dedup: ClassVar[Dict[Tuple[Any, ...], List[Any]]] = {}   # key -> [window start (ns), repeated, caller]
+    dedup_sweep: int = 0
+    buckets: ClassVar[Dict[Tuple[str, int], List[Any]]] = {} # call site -> [tokens, last (ns), suppressed, trace_type, caller]
+    mp_queue: Any = None
+    mp_parent_pid: int = -1
+
+    # crash_init: last N messages of all levels -> file only on fatal, exception or unhandled exception
+
+    crash_buffer: Deque[CrashEntry] | None = None
+    crash_path: Path = Path("./logs")
+    crash_filename: str = "crash"
+    crash_dumps: int = 0
+    crash_max_dumps: int = 10
+    crash_hooks: Tuple[Any, Any] | None = None # previous sys.excepthook, threading.excepthook
+    mp_listener: threading.Thread | None = None
 
     @classmethod
-    def set(cls, **kwargs: Any) -> None: # color, reduced_mode, debug_mode, show_timestamp, timezone, show_caller
+    def set(cls, **kwargs: Any) -> None: # color, reduced_mode, debug_mode, show_timestamp, timezone, show_caller, async_...
 
         for key, value in kwargs.items():
             if key in cls.settings:
                 cls.settings[key] = value
 
+                if key == "appl_folder":
+                    cls.caller_cache.clear()
+
+                if key == "format" and value not in trace_formats:
+                    cls.settings["format"] = "text"
+                    Trace.error(f"format '{value}' unknown -> {trace_formats}")
+
+                if key == "async_policy" and value not in async_policies:
+                    cls.settings["async_policy"] = "block"
+                    Trace.error(f"async_policy '{value}' unknown -> {async_policies}")
+
                 if key == "timezone" and isinstance(value, str):
 
                     # timezone valid: "UTC", "Europe/Berlin"), "America/New_York" ...
@@ -176,81 +402,99 @@ def set(cls, **kwargs: Any) -> None: # color, reduced_mode, debug_mode, show_tim
             else:
                 Trace.fatal(f"trace settings: unknown parameter '{key}'")
 
+        cls._check_tty()
+
+        if "dedup_window" in kwargs or "rate_limit" in kwargs or "rate_burst" in kwargs:
+            cls._filter_flush()
+            cls.dedup.clear()
+            cls.buckets.clear()
+            cls.filter_active = cls.settings["dedup_window"] > 0 or cls.settings["rate_limit"] > 0
+
+            if cls.filter_active and not cls.filter_registered:
+                atexit.register(cls._filter_flush)
+                cls.filter_registered = True
+
+        if any(key.startswith("async_") for key in kwargs):
+            cls._async_stop()
+            if cls.settings["async_output"]:
+                cls._async_start()
+
     # info, update, download (not in reduced mode)
 
     @classmethod
-    def info(cls, message: str = "", *optional: Any) -> None:
+    def info(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
         if not cls.settings["reduced_mode"]:
-            pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-            cls._show_message(cls._check_file_output(), pre, message, *optional)
+            cls._emit("info", message, optional, args)
+        elif cls.crash_buffer is not None:
+            cls._crash_record("info", message, optional, args)
 
     @classmethod
-    def update(cls, message: str = "", *optional: Any) -> None:
+    def update(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
         if not cls.settings["reduced_mode"]:
-            pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-            cls._show_message(cls._check_file_output(), pre, message, *optional)
+            cls._emit("update", message, optional, args)
+        elif cls.crash_buffer is not None:
+            cls._crash_record("update", message, optional, args)
 
     @classmethod
-    def download(cls, message: str = "", *optional: Any) -> None:
+    def download(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
         if not cls.settings["reduced_mode"]:
-            pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-            cls._show_message(cls._check_file_output(), pre, message, *optional)
+            cls._emit("download", message, optional, args)
+        elif cls.crash_buffer is not None:
+            cls._crash_record("download", message, optional, args)
 
     # action, result
 
     @classmethod
-    def action(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def action(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("action", message, optional, args)
 
     @classmethod
-    def result(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def result(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("result", message, optional, args)
 
     # important => text MAGENTA, BOLD
 
     @classmethod
-    def important(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{Color.MAGENTA}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, f"{Color.MAGENTA}{Color.BOLD}{message}{Color.RESET}", *optional)
+    def important(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("important", message, optional, args)
 
     # warning, error, exception, fatal => RED
 
     @classmethod
-    def warning(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def warning(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("warning", message, optional, args)
 
     @classmethod
-    def error(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{Color.RED}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def error(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("error", message, optional, args)
 
     @classmethod
-    def exception(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{Color.RED}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def exception(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("exception", message, optional, args)
+        if cls.crash_buffer is not None:
+            cls.crash_dump()
 
     @classmethod
-    def fatal(cls, message: str = "", *optional: Any) -> None:
-        pre = f"{cls._get_time()}{Color.RED}{Color.BOLD}{cls._get_pattern()}{cls._get_caller()}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def fatal(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
+        cls._emit("fatal", message, optional, args)
+        if cls.crash_buffer is not None:
+            cls.crash_dump()
+        cls.flush()
         raise SystemExit
 
     # debug, wait (only in debug mode)
 
     @classmethod
-    def debug(cls, message: str = "", *optional: Any) -> None:
+    def debug(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
         if cls.settings["debug_mode"] and not cls.settings["reduced_mode"]:
-            pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-            cls._show_message(cls._check_file_output(), pre, message, *optional)
+            cls._emit("debug", message, optional, args)
+        elif cls.crash_buffer is not None:
+            cls._crash_record("debug", message, optional, args)
 
     @classmethod
-    def wait(cls, message: str = "", *optional: Any) -> None:
+    def wait(cls, message: Message = "", *optional: Any, args: Tuple[Any, ...] | None = None) -> None:
         if cls.settings["debug_mode"]:
-            pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_caller()}"
-            cls._show_message(cls._check_file_output(), pre, message, *optional)
+            cls._emit("wait", message, optional, args)
             try:
                 print(f"{Color.RED}{Color.BOLD} >>> Press Any key to continue or ESC to exit <<< {Color.RESET}", end="", flush=True)  # noqa: T201
 
@@ -284,17 +528,37 @@ def wait(cls, message: str = "", *optional: Any) -> None:
             except KeyboardInterrupt:
                 sys.exit()
 
+        elif cls.crash_buffer is not None:
+            cls._crash_record("wait", message, optional, args)
+
     # decorator -> 12:21:39.836  ooo  <text>: 1.486 sec
 
     @classmethod
-    def decorator(cls, message: str = "", *optional: Any, path: str = "decorator") -> None:
-        pre = f"{cls._get_time()}{cls._get_pattern()}{cls._get_decorator_caller(path)}"
-        cls._show_message(cls._check_file_output(), pre, message, *optional)
+    def decorator(cls, message: Message = "", *optional: Any, path: str = "decorator", args: Tuple[Any, ...] | None = None) -> None:
+        cls._dispatch((time.time_ns(), "decorator", path, 0, "", get_message(message, args), optional))
 
     # file_init, file_save
 
+    # file_init(pattern_list, csv)                             -> messages in memory, written by file_save(path, filename)
+    # file_init(pattern_list, csv, path=path, filename=filename) -> streaming: each message is appended to the file
+    #  - max_bytes:   rotate, if the file exceeds max_bytes (0: no size limit)
+    #  - max_seconds: rotate, if the file is older than max_seconds (0: no time limit)
+    #  - compress:    gzip the rotated files
+    #  - max_files:   keep only the last max_files rotated files of this run (0: all)
+
     @classmethod
-    def file_init(cls, pattern_list: None | List[str] = None, csv: bool = False) -> None:
+    def file_init(
+        cls,
+        pattern_list: None | List[str] = None,
+        csv: bool = False,
+        path: Path | str | None = None,
+        *,
+        filename: str | None = None,
+        max_bytes: int = 0,
+        max_seconds: float = 0,
+        compress: bool = False,
+        max_files: int = 0,
+    ) -> None:
         if pattern_list is None:
             cls.pattern = []
         else:
@@ -302,171 +566,1028 @@ def file_init(cls, pattern_list: None | List[str] = None, csv: bool = False) ->
         cls.csv = csv
         cls.messages = []
 
+        cls.remove_sink("file")
+
+        sink: TraceSink
+        if path is not None and filename is not None:
+            try:
+                sink = FileWriter(Path(path), filename, max_bytes=max_bytes, max_seconds=max_seconds, compress=compress, csv=csv, max_files=max_files)
+            except OSError as e:
+                Trace.error(f"open {e}")
+                return
+        else:
+            sink = MemorySink(cls.messages, csv)
+
+        cls.add_sink("file", sink, levels=cls.pattern)
+
     @classmethod
-    def file_save(cls, path: Path | str, filename: str) -> None:
-        trace_path = Path(path)
+    def file_save(cls, path: Path | str | None = None, filename: str | None = None) -> None:
+
+        # streaming -> close the current file
 
-        text = ""
-        for message in Trace.messages:
-            text += message + "\n"
+        if isinstance(cls.sinks.get("file", (None,))[0], FileWriter):
+            cls.remove_sink("file")
+            return
+
+        if path is None or filename is None:
+            Trace.error("file_save: path and filename missing")
+            return
+
+        trace_path = Path(path)
 
-        curr_time = cls._get_time_timezone(cls.settings["timezone"]).replace(":", "-")
+        text = "".join(message + "\n" for message in cls.messages)
 
         try:
             if not trace_path.is_dir():
-                Path(path).mkdir(parents=True)
+                trace_path.mkdir(parents=True)
 
-            file_path = trace_path / f"{filename} • {curr_time}.txt"
+            file_path = trace_path / f"{filename} • {get_file_time()}.txt"
             with file_path.open(mode="w", encoding="utf-8", newline="\n") as file:
                 file.write(text)
 
         except OSError as e:
             Trace.error(f"write {e}")
 
-        cls.messages = []
+        cls.messages.clear()
 
-    # redirect()
+    # crash_init(path, filename, size) -> ring buffer: last 'size' messages of all levels (also debug without debug_mode)
+    #  - written only by Trace.fatal(), Trace.exception() or an unhandled exception (main thread, threads)
+    #  - "<filename> • <time>.txt", at most max_dumps files per run
+    #  - crash_init(size=0) -> off
 
     @classmethod
-    def redirect(cls, output: Callable[..., None]) -> None:
-        cls.output = output
+    def crash_init(
+        cls,
+        path: Path | str = "./logs",
+        filename: str = "crash",
+        size: int = 1000,
+        max_dumps: int = 10,
+        hook: bool = True,
+    ) -> None:
+        cls.crash_path      = Path(path)
+        cls.crash_filename  = filename
+        cls.crash_dumps     = 0
+        cls.crash_max_dumps = max_dumps
+
+        if size <= 0:
+            cls.crash_buffer = None
+            cls._crash_unhook()
+            return
 
-    # INTERNAL
+        cls.crash_buffer = deque(maxlen=size)
+
+        if hook:
+            cls._crash_hook()
+        else:
+            cls._crash_unhook()
+
+    # crash_dump() -> buffer to file (+ reason e.g. traceback), buffer is empty afterwards
 
     @classmethod
-    def _check_file_output(cls) -> bool:
-        current_frame: FrameType | None = inspect.currentframe()
-        if current_frame is None:
-            return False
+    def crash_dump(cls, reason: str = "") -> Path | None:
+        crash_buffer = cls.crash_buffer
+        if crash_buffer is None or cls.crash_dumps >= cls.crash_max_dumps:
+            return None
+
+        cls.crash_dumps += 1
+
+        entries = list(crash_buffer)
+        crash_buffer.clear()
+
+        text = "".join(cls._crash_text(entry) + "\n" for entry in entries)
+        if reason:
+            text += reason + "\n"
+
+        try:
+            if not cls.crash_path.is_dir():
+                cls.crash_path.mkdir(parents=True)
+
+            file_time = get_file_time()
+            file_path = cls.crash_path / f"{cls.crash_filename} • {file_time}.txt"
+
+            number = 1
+            while file_path.exists():
+                number += 1
+                file_path = cls.crash_path / f"{cls.crash_filename} • {file_time} ({number}).txt"
 
-        caller_frame: FrameType | None = current_frame.f_back
-        if caller_frame is None:
+            with file_path.open(mode="w", encoding="utf-8", newline="\n") as file:
+                file.write(text)
+
+        except OSError as e:
+            Trace.error(f"write {e}")
+            return None
+
+        return file_path
+
+    # is_enabled("debug") -> guard for expensive messages, e.g.
+    #
+    # if Trace.is_enabled("debug"):
+    #     Trace.debug(build_expensive_message())
+
+    @classmethod
+    def is_enabled(cls, trace_type: str) -> bool:
+        route = cls.routes.get(trace_type)
+        if route is None or not route[1]: # no sink for this level
             return False
 
-        trace_type = caller_frame.f_code.co_name
-        return trace_type in cls.pattern
+        if trace_type == "wait":
+            return bool(cls.settings["debug_mode"])
+
+        if trace_type == "debug":
+            return bool(cls.settings["debug_mode"]) and not cls.settings["reduced_mode"]
+
+        if trace_type in reduced_types:
+            return not cls.settings["reduced_mode"]
+
+        return trace_type in pattern
+
+    # context("worker 1") -> message prefix "[worker 1] " for all messages of the current thread
+    #
+    # with Trace.context("worker 1"):
+    #     Trace.info("start")
+
+    @classmethod
+    @contextlib.contextmanager
+    def context(cls, name: str) -> Generator[None, None, None]:  # noqa: UP043
+        names: List[str] | None = getattr(thread_context, "names", None)
+        if names is None:
+            names = []
+            thread_context.names = names
+
+        names.append(name)
+        try:
+            yield
+        finally:
+            names.pop()
+
+    # enable_multiprocess() -> messages of child processes are written by the parent process (same sinks, no interleaving)
+    #  - fork: nothing more to do
+    #  - spawn (Windows, macOS): Pool(initializer=Trace.attach_multiprocess, initargs=(queue,))
+    #  - start_method: same as the processes e.g. "spawn" -> multiprocessing.get_context("spawn")
+
+    @classmethod
+    def enable_multiprocess(cls, start_method: str | None = None) -> Any:
+        if cls.mp_queue is not None and cls.mp_parent_pid == os.getpid():
+            return cls.mp_queue
+
+        cls.mp_queue      = multiprocessing.get_context(start_method).Queue()
+        cls.mp_parent_pid = os.getpid()
+        cls.mp_listener   = threading.Thread(target=cls._mp_listen, args=(cls.mp_queue,), name="trace-multiprocess", daemon=True)
+        cls.mp_listener.start()
+
+        atexit.register(cls.disable_multiprocess)
+        return cls.mp_queue
+
+    @classmethod
+    def attach_multiprocess(cls, mp_queue: Any) -> None:
+        cls.mp_queue      = mp_queue
+        cls.mp_parent_pid = -1
+
+    @classmethod
+    def disable_multiprocess(cls) -> None:
+        mp_queue    = cls.mp_queue
+        mp_listener = cls.mp_listener
+        if mp_queue is None or mp_listener is None or cls.mp_parent_pid != os.getpid():
+            return
+
+        mp_queue.put(None)
+        mp_listener.join()
+
+        cls.mp_queue    = None
+        cls.mp_listener = None
+
+    # redirect(function) -> replaces the sink "stdout" (e.g. qDebug), redirect(None) -> stdout again
+
+    @classmethod
+    def redirect(cls, output: Callable[..., None] | None) -> None:
+        if output is None:
+            cls.add_sink("stdout", StdoutSink())
+        else:
+            cls.add_sink("stdout", CallableSink(output))
+
+    # sinks: several outputs at the same time, each with its own minimum level and formatter
+    #  - Trace.add_sink("gui", qDebug, level="info")                     # function -> CallableSink
+    #  - Trace.add_sink("errors", FileWriter(Path("./logs"), "errors"), level="error")
+    #  - Trace.add_sink("last", RingBufferSink(1000), levels=["warning", "error"])
+    #  - Trace.add_sink("json", FileWriter(Path("./logs"), "trace"), formatter="jsonl")
+    #
+    # predefined: "stdout" (StdoutSink, Trace.redirect), "file" (Trace.file_init)
+
+    @classmethod
+    def add_sink(
+        cls,
+        name: str,
+        sink: TraceSink | Callable[[str], Any],
+        level: str = "debug",
+        levels: List[str] | None = None,
+        formatter: Formatter = "text",
+    ) -> None:
+        if not isinstance(sink, TraceSink):
+            sink = CallableSink(sink)
+
+        if level not in trace_levels:
+            Trace.error(f"level '{level}' unknown -> {list(trace_levels)}")
+            level = "debug"
+
+        if isinstance(formatter, str) and formatter not in trace_formats:
+            Trace.error(f"formatter '{formatter}' unknown -> {trace_formats}")
+            formatter = "text"
+
+        with cls.lock:
+            entry = cls.sinks.get(name)
+            cls.sinks[name] = (sink, trace_levels[level], None if levels is None else frozenset(levels), formatter)
+            cls._build_routes()
+
+        if not cls.sinks_registered:
+            atexit.register(cls._close_sinks)
+            cls.sinks_registered = True
+
+        if entry is not None and entry[0] is not sink:
+            cls._close_sink(entry[0])
+
+    @classmethod
+    def remove_sink(cls, name: str) -> None:
+        with cls.lock:
+            entry = cls.sinks.pop(name, None)
+            cls._build_routes()
+
+        if entry is not None:
+            cls._close_sink(entry[0])
+
+    @classmethod
+    def get_sink(cls, name: str) -> TraceSink | None:
+        entry = cls.sinks.get(name)
+        if entry is None:
+            return None
+        return entry[0]
+
+    # flush() -> wait until all queued messages are written (async_output, sinks)
+
+    @classmethod
+    def flush(cls) -> None:
+        if cls.filter_active:
+            cls._filter_flush()
+
+        if cls.async_writer is not None:
+            cls.async_writer.flush()
+
+        for name, (sink, _, _, _) in list(cls.sinks.items()):
+            try:
+                sink.flush()
+            except OSError as e:
+                cls.remove_sink(name)
+                Trace.error(f"write {e}")
+
+    # dropped() -> number of messages dropped by async_policy "drop_oldest" or "drop"
+
+    @classmethod
+    def dropped(cls) -> int:
+        if cls.async_writer is not None:
+            return cls.async_writer.dropped
+        return 0
+
+    # INTERNAL
+
+    # https://docs.python.org/3/library/io.html#io.IOBase.isatty
+
+    @classmethod
+    def _check_tty(cls) -> None:
+        stream = sys.stdout
+        is_tty = hasattr(stream, "isatty") and stream.isatty()
+        cls.stdout_color = bool(cls.settings["color"]) and is_tty
+
+        with cls.lock:
+            cls._build_routes()
+
+    @classmethod
+    def _mp_listen(cls, mp_queue: Any) -> None:
+        while True:
+            try:
+                record = mp_queue.get()
+            except (EOFError, OSError, ValueError):
+                return
+
+            if record is None:
+                return
+
+            cls._output(record)
+
+    # suppressed message -> crash buffer (one frame lookup, no formatting)
+
+    @classmethod
+    def _crash_record(cls, trace_type: str, message: Message, optional: Tuple[Any, ...], args: Tuple[Any, ...] | None) -> None:
+        crash_buffer = cls.crash_buffer
+        if crash_buffer is None:
+            return
+
+        trace_frame = sys._getframe(2)  # noqa: SLF001
+        crash_buffer.append((time.time_ns(), trace_type, trace_frame.f_code, trace_frame.f_lineno, "", message, optional, args))
+
+    @classmethod
+    def _crash_text(cls, entry: CrashEntry) -> str:
+        if len(entry) == 8:
+            time_ns, trace_type, code, line_no, _, message, optional, args = entry
+
+            path = cls.caller_cache.get(code)
+            if path is None:
+                path = cls._get_path(code)
+
+            try:
+                text = get_message(message, args)
+            except Exception as e:  # noqa: BLE001
+                text = f"{message!r} -> {e}"
+
+            entry = (time_ns, trace_type, path, line_no, code.co_qualname, text, optional)
+
+        texts: Dict[Any, str] = {}
+        cls._format_text(entry, ("plain",), texts)
+        return texts["plain"]
+
+    @classmethod
+    def _crash_hook(cls) -> None:
+        if cls.crash_hooks is None:
+            cls.crash_hooks = (sys.excepthook, threading.excepthook)
+            sys.excepthook       = cls._crash_excepthook
+            threading.excepthook = cls._crash_thread_excepthook
+
+    @classmethod
+    def _crash_unhook(cls) -> None:
+        if cls.crash_hooks is not None:
+            sys.excepthook, threading.excepthook = cls.crash_hooks
+            cls.crash_hooks = None
+
+    @classmethod
+    def _crash_excepthook(cls, exc_type: type[BaseException], exc_value: BaseException, exc_traceback: Any) -> None:
+        if not issubclass(exc_type, KeyboardInterrupt):
+            cls.crash_dump("".join(traceback.format_exception(exc_type, exc_value, exc_traceback)).rstrip("\n"))
+
+        excepthook = sys.__excepthook__ if cls.crash_hooks is None else cls.crash_hooks[0]
+        excepthook(exc_type, exc_value, exc_traceback)
+
+    @classmethod
+    def _crash_thread_excepthook(cls, args: threading.ExceptHookArgs) -> None:
+        if args.exc_value is not None:
+            name = args.thread.name if args.thread is not None else "?"
+            cls.crash_dump(f"thread '{name}'\n" + "".join(traceback.format_exception(args.exc_type, args.exc_value, args.exc_traceback)).rstrip("\n"))
+
+        excepthook = threading.__excepthook__ if cls.crash_hooks is None else cls.crash_hooks[1]
+        excepthook(args)
+
+    # trace_type -> sinks with their format, e.g.
+    #   "info"  -> (("color", "csv"), (("stdout", <StdoutSink>, "color"), ("file", <MemorySink>, "csv")))
+    #   "debug" -> ((), ()) -> no formatting at all
+    #
+    # format "text" -> sink.text_format: "color", "plain" or "csv" (format="jsonl" -> "jsonl")
+
+    @classmethod
+    def _build_routes(cls) -> None:
+        jsonl = cls.settings["format"] == "jsonl"
+
+        routes: Dict[str, Route] = {}
+        for trace_type, rank in trace_levels.items():
+            formats: List[Any] = []
+            targets: List[Tuple[str, TraceSink, Any]] = []
+
+            for name, (sink, min_rank, levels, formatter) in cls.sinks.items():
+                if levels is None:
+                    if rank < min_rank:
+                        continue
+                elif trace_type not in levels:
+                    continue
+
+                if formatter == "text":
+                    fmt: Any = "jsonl" if jsonl else sink.text_format
+                else:
+                    fmt = formatter
+
+                if fmt not in formats:
+                    formats.append(fmt)
+                targets.append((name, sink, fmt))
+
+            routes[trace_type] = (tuple(formats), tuple(targets))
+
+        cls.routes = routes # one assignment -> consistent for other threads
+
+    @classmethod
+    def _close_sink(cls, sink: TraceSink) -> None:
+        try:
+            sink.close()
+        except OSError as e:
+            Trace.error(f"write {e}")
+
+    # atexit: files are closed, later messages -> stdout only
+
+    @classmethod
+    def _close_sinks(cls) -> None:
+        for name in list(cls.sinks):
+            if name != "stdout":
+                cls.remove_sink(name)
+
+    @classmethod
+    def _async_start(cls) -> None:
+        if not cls.async_registered:
+            atexit.register(cls._async_stop)
+            cls.async_registered = True
+
+        cls.async_writer = AsyncWriter(
+            queue_size     = cls.settings["async_queue_size"],
+            flush_interval = cls.settings["async_flush_interval"],
+            policy         = cls.settings["async_policy"],
+        )
+
+    # fork (os.fork, multiprocessing "fork"): the child inherits the locks in any state, but no threads
+    #  - new locks (a lock held by another thread at the fork would never be released in the child)
+    #  - async_output: no writer thread in the child -> synchronous output
+    #    (the queued messages belong to the parent, children often end with os._exit() -> no flush at exit)
+
+    @classmethod
+    def _after_fork_child(cls) -> None:
+        cls.lock        = threading.RLock()
+        cls.filter_lock = threading.Lock()
+
+        for sink, _, _, _ in cls.sinks.values():
+            sink.after_fork()
+
+        cls.async_writer = None
+
+    @classmethod
+    def _async_stop(cls) -> None:
+        async_writer = cls.async_writer
+        if async_writer is None:
+            return
+
+        cls.async_writer = None
+        async_writer.close()
+
+        if async_writer.dropped > 0:
+            Trace.warning(f"async output: {async_writer.dropped} message(s) dropped ('{async_writer.policy}')")
+
+    # one frame lookup per message: sys._getframe(2) -> caller of Trace.info(), Trace.error(), ...
+    # formatting needs no lock, only the output is serialized (Trace.lock)
+    #
+    # no sink for this trace_type (and no crash buffer, no child process queue) -> return before the message is built
+
+    @classmethod
+    def _emit(cls, trace_type: str, message: Message, optional: Tuple[Any, ...], args: Tuple[Any, ...] | None) -> None:
+        route = cls.routes.get(trace_type)
+        if (route is None or not route[1]) and cls.crash_buffer is None and (cls.mp_queue is None or os.getpid() == cls.mp_parent_pid):
+            return
+
+        trace_frame = sys._getframe(2)  # noqa: SLF001
+        code = trace_frame.f_code
+
+        path = cls.caller_cache.get(code)
+        if path is None:
+            path = cls._get_path(code)
+
+        text = get_message(message, args)
+
+        context = getattr(thread_context, "names", None)
+        if context:
+            text = f"[{' › '.join(context)}] {text}"
+
+        cls._dispatch((time.time_ns(), trace_type, path, trace_frame.f_lineno, code.co_qualname, text, optional))
+
+    # record -> multiprocess queue (child process) or jsonl / text output
+
+    @classmethod
+    def _dispatch(cls, record: TraceRecord) -> None:
+        crash_buffer = cls.crash_buffer
+        if crash_buffer is not None:
+            crash_buffer.append(record)
+
+        mp_queue = cls.mp_queue
+        if mp_queue is not None and os.getpid() != cls.mp_parent_pid:
+            try:
+                mp_queue.put(get_picklable_record(record))
+                return
+            except (OSError, ValueError):
+                cls.mp_queue = None # queue closed -> local output
+
+        if cls.filter_active and record[1] not in unfiltered_types:
+            show, summaries = cls._filter(record)
+            for summary in summaries:
+                cls._output(summary)
+            if not show:
+                return
+
+        cls._output(record)
+
+    # one dict lookup -> sinks of this trace_type, each format is built only once
+
+    @classmethod
+    def _output(cls, record: TraceRecord) -> None:
+        route = cls.routes.get(record[1])
+        if route is None or not route[1]:
+            return
+
+        formats, targets = route
+
+        texts: Dict[Any, str] = {}
+        for fmt in formats:
+            if fmt == "jsonl":
+                texts[fmt] = cls._format_json(record)
+            elif callable(fmt):
+                texts[fmt] = fmt(record)
+            elif fmt not in texts:
+                cls._format_text(record, formats, texts)
+
+        failed: List[Tuple[str, OSError]] = []
+        with cls.lock:
+            for name, sink, fmt in targets:
+                try:
+                    sink.write(texts[fmt])
+                except OSError as e:
+                    failed.append((name, e))
+
+        for name, e in failed:
+            cls.remove_sink(name)
+            Trace.error(f"write {e}")
+
+    # dedup_window: identical messages (trace_type, caller, message) within the window are shown once
+    #  -> "hidden row: 5 > repeated 120 times" (next occurrence after the window or Trace.flush())
+    #
+    # rate_limit: token bucket per call site (rate_limit messages/sec, burst: rate_burst)
+    #  -> "12 message(s) suppressed (rate limit)" (next shown message of the call site or Trace.flush())
+
+    @classmethod
+    def _filter(cls, record: TraceRecord) -> Tuple[bool, List[TraceRecord]]:
+        time_ns, trace_type, path, line_no, caller, message, optional = record
+
+        summaries: List[TraceRecord] = []
+
+        with cls.filter_lock:
+            window = int(cls.settings["dedup_window"] * 1_000_000_000)
+            if window > 0:
+                if time_ns - cls.dedup_sweep >= window:
+                    summaries += cls._dedup_sweep(time_ns - window)
+                    cls.dedup_sweep = time_ns
+
+                key = (trace_type, path, line_no, message, optional)
+                try:
+                    entry = cls.dedup.get(key)
+                except TypeError: # unhashable optional values -> no dedup
+                    key, entry = None, None
+
+                if entry is not None and time_ns - entry[0] < window:
+                    entry[1] += 1
+                    return False, summaries
+
+                if entry is not None and entry[1] > 0:
+                    summaries.append((time_ns, trace_type, path, line_no, caller, message, (*optional, f"repeated {entry[1]} times")))
+
+                if key is not None:
+                    cls.dedup[key] = [time_ns, 0, caller]
+
+            rate = cls.settings["rate_limit"]
+            if rate > 0:
+                burst  = max(1, cls.settings["rate_burst"])
+                site   = (path, line_no)
+                bucket = cls.buckets.get(site)
+                if bucket is None:
+                    bucket = [burst, time_ns, 0, trace_type, caller]
+                    cls.buckets[site] = bucket
+
+                bucket[0] = min(burst, bucket[0] + (time_ns - bucket[1]) / 1_000_000_000 * rate)
+                bucket[1] = time_ns
+
+                if bucket[0] < 1:
+                    bucket[2] += 1
+                    return False, summaries
+
+                bucket[0] -= 1
+                if bucket[2] > 0:
+                    summaries.append((time_ns, trace_type, path, line_no, caller, f"{bucket[2]} message(s) suppressed (rate limit)", ()))
+                    bucket[2] = 0
+
+        return True, summaries
+
+    # dedup entries older than 'expired' -> summary records (if repeated)
+
+    @classmethod
+    def _dedup_sweep(cls, expired: int) -> List[TraceRecord]:
+        summaries: List[TraceRecord] = []
+
+        for key, entry in list(cls.dedup.items()):
+            if entry[0] <= expired:
+                if entry[1] > 0:
+                    trace_type, path, line_no, message, optional = key
+                    summaries.append((time.time_ns(), trace_type, path, line_no, entry[2], message, (*optional, f"repeated {entry[1]} times")))
+                del cls.dedup[key]
+
+        return summaries
+
+    @classmethod
+    def _filter_flush(cls) -> None:
+        with cls.filter_lock:
+            summaries = cls._dedup_sweep(time.time_ns())
+
+            for (path, line_no), bucket in cls.buckets.items():
+                if bucket[2] > 0:
+                    summaries.append((time.time_ns(), bucket[3], path, line_no, bucket[4], f"{bucket[2]} message(s) suppressed (rate limit)", ()))
+                    bucket[2] = 0
+
+        for summary in summaries:
+            cls._output(summary)
 
     # show_timestamp=False -> ""
     # timezone=False       -> "13:26:14.768"
     # timezone=True        -> "13:26:14.768+0100"
     # timezone="UTC"       -> "12:26:14.768+0000" (if tzdata is installed)
+    #
+    # "13:26:14" + "+0100" are cached per wall-clock second, only ".768" is computed per message
 
     @classmethod
-    def _get_time(cls) -> str:
-        if cls.settings["show_timestamp"]:
-            curr_time = cls._get_time_timezone(cls.settings["timezone"])
-            return f"{Color.BLUE}{curr_time}{Color.RESET}\t"
+    def _get_time_timezone(cls, tz: bool | str, time_ns: int) -> str:
+        time_cache, milliseconds = cls._get_time_cache(tz, time_ns)
+        return f"{time_cache[2]}.{milliseconds:03d}{time_cache[3]}"
 
-        return ""
+    # jsonl: "2025-04-07T13:26:14.768+01:00"
 
     @classmethod
-    def _get_time_timezone(cls, tz: bool | str) -> str:
-        if tz is False:
-            return datetime.now().astimezone().strftime("%H:%M:%S.%f")[:-3]
+    def _get_time_iso(cls, tz: bool | str, time_ns: int) -> str:
+        time_cache, milliseconds = cls._get_time_cache(tz, time_ns)
+        return f"{time_cache[4]}.{milliseconds:03d}{time_cache[5]}"
 
-        elif tz is True:
-            d = datetime.now().astimezone()
-            return d.strftime("%H:%M:%S.%f")[:-3] + d.strftime("%z")
+    @classmethod
+    def _get_time_cache(cls, tz: bool | str, time_ns: int) -> Tuple[TimeCache, int]:
+        seconds, nanoseconds = divmod(time_ns, 1_000_000_000)
 
-        # "UTC", "Europe/Berlin", "America/New_York", ...
+        time_cache = cls.time_cache
+        if time_cache[0] != seconds or time_cache[1] != tz:
+            if isinstance(tz, bool):
+                d = datetime.fromtimestamp(seconds).astimezone()
 
-        else:
-            timezone = ZoneInfo(tz)
-            d = datetime.now().astimezone(timezone)
-            return d.strftime("%H:%M:%S.%f")[:-3] + d.strftime("%z")
+            # "UTC", "Europe/Berlin", "America/New_York", ...
 
-    # " --> ", " >>> ", " ==> ", "-----", ..., " ooo "
+            else:
+                d = datetime.fromtimestamp(seconds, get_zoneinfo(tz))
 
-    @staticmethod
-    def _get_pattern() -> str:
-        current_frame: FrameType | None = inspect.currentframe()
-        if current_frame is None:
-            return pattern["unknown"] # should never happens
+            iso = d.isoformat() # "2025-04-07T13:26:14+01:00"
+            if tz is False:
+                time_cache = (seconds, tz, d.strftime("%H:%M:%S"), "", iso[:19], iso[19:])
+            else:
+                time_cache = (seconds, tz, d.strftime("%H:%M:%S"), d.strftime("%z"), iso[:19], iso[19:])
 
-        caller_frame: FrameType | None = current_frame.f_back
-        if caller_frame is None:
-            return pattern["unknown"] # should never happens
+            cls.time_cache = time_cache # one assignment -> consistent for other threads
 
-        trace_type = caller_frame.f_code.co_name # info, update, download ...
-        if trace_type in pattern:
-            return pattern[trace_type]
+        return time_cache, nanoseconds // 1_000_000
 
-        return pattern["unknown"]      # should never happens
-
-    # [utils/file.py:413 » export_file]
+    # code object -> "utils/file.py"
 
     @classmethod
-    def _get_caller(cls) -> str:
-        if cls.settings["show_caller"] is False:
-            return f"{Color.RESET} "
-
-        path = inspect.stack()[2][1].replace("\\", "/")
+    def _get_path(cls, code: CodeType) -> str:
+        path = code.co_filename.replace("\\", "/")
         path = path.split(cls.settings["appl_folder"])[-1]
 
-        current_frame: FrameType | None = inspect.currentframe()
-        if current_frame is None:
-            return ""
+        cls.caller_cache[code] = path
+        return path
 
-        caller_frame: FrameType | None = current_frame.f_back
-        if caller_frame is None:
-            return ""
-
-        trace_frame: FrameType | None = caller_frame.f_back
-        if trace_frame is None:
-            return ""
+    # [utils/file.py:413 » export_file]
+    # [duration] -> decorator
 
-        line_no = str(trace_frame.f_lineno).zfill(3)
+    @staticmethod
+    def _get_caller(trace_type: str, path: str, line_no: int, caller: str) -> str:
+        if trace_type == "decorator":
+            return f"[{path}]"
 
-        caller = trace_frame.f_code.co_qualname
-        caller = caller.replace(".<locals>.", " → ")
+        line = str(line_no).zfill(3)
 
         if caller == "<module>":
-            return f"\t{Color.BLUE}[{path}:{line_no}]{Color.RESET}\t"
-        else:
-            return f"\t{Color.BLUE}[{path}:{line_no} » {caller}]{Color.RESET}\t"
+            return f"[{path}:{line}]"
 
-    @classmethod
-    def _get_decorator_caller(cls, text: str) -> str:
-        if cls.settings["show_caller"] is False:
-            return f"{Color.RESET} "
+        if ".<locals>." in caller:
+            caller = caller.replace(".<locals>.", " → ")
 
-        return f"\t{Color.BLUE}[{text}]{Color.RESET}\t"
+        return f"[{path}:{line} » {caller}]"
+
+    # {"ts": "2025-04-07T13:17:22.499+01:00", "level": "result", "file": "helper/excel_write.py", "line": 487, "func": "export_to_excel", "msg": "57 media file(s)", "extra": []}
+    #  - no color handling (escape codes are only removed, if the message contains some)
+
+    @classmethod
+    def _format_json(cls, record: TraceRecord) -> str:
+        time_ns, trace_type, path, line_no, caller, message, optional = record
+
+        if "\033" in message:
+            message = Color.clear(message)
+
+        return dumps_json({
+            "ts":    cls._get_time_iso(cls.settings["timezone"], time_ns),
+            "level": trace_type,
+            "file":  path if trace_type != "decorator" else "",
+            "line":  line_no,
+            "func":  caller if trace_type != "decorator" else path,
+            "msg":   message,
+            "extra": optional,
+        })
 
     # 13:17:22.499  ==>  [helper/excel_write.py:487 » export_to_excel]  57 media file(s)
+    #  - "color", "plain" and "csv" (plain with tabs) are built from the same parts (no regex for the template)
+    #  - escape codes are removed only from messages which contain some
 
     @classmethod
-    def _show_message(cls, file_output: bool, pre: str, message: str, *optional: Any) -> None:
+    def _format_text(cls, record: TraceRecord, formats: Tuple[Any, ...], texts: Dict[Any, str]) -> None:
+        time_ns, trace_type, path, line_no, caller, message, optional = record
+
+        if cls.settings["show_timestamp"]:
+            curr_time  = cls._get_time_timezone(cls.settings["timezone"], time_ns)
+            time_color = f"{Color.BLUE}{curr_time}{Color.RESET}\t"
+            time_plain = f"{curr_time}\t"
+        else:
+            time_color = time_plain = ""
+
+        if cls.settings["show_caller"] is False:
+            caller_color = f"{Color.RESET} "
+            caller_plain = " "
+        else:
+            caller_text  = cls._get_caller(trace_type, path, line_no, caller)
+            caller_color = f"\t{Color.BLUE}{caller_text}{Color.RESET}\t"
+            caller_plain = f"\t{caller_text}\t"
+
         extra = ""
         for opt in optional:
             extra += " > " + str(opt)
 
-        text = f"{pre}{message}{extra}"
-        text_no_tabs = text.replace("\t", " ")
+        if "color" in formats:
+            if trace_type == "important":
+                message_color = f"{Color.MAGENTA}{Color.BOLD}{message}{Color.RESET}{extra}"
+            else:
+                message_color = f"{message}{extra}"
 
-        if cls.output is not None:
-            cls.output(text_no_tabs)
-            return
+            texts["color"] = f"{time_color}{cls.trace_pattern[trace_type]}{caller_color}{message_color}".replace("\t", " ")
 
-        if file_output:
-            if cls.csv:
-                cls.messages.append(Color.clear(text))
-            else:
-                cls.messages.append(Color.clear(text_no_tabs))
+        if "plain" in formats or "csv" in formats:
+            message_plain = f"{message}{extra}"
+            if "\033" in message_plain:
+                message_plain = Color.clear(message_plain)
 
-        # https://docs.python.org/3/library/io.html#io.IOBase.isatty
+            text_plain = f"{time_plain}{pattern[trace_type]}{caller_plain}{message_plain}"
+            texts["csv"]   = text_plain
+            texts["plain"] = text_plain.replace("\t", " ")
 
-        def is_redirected(stream: Any) -> bool:
-            return not hasattr(stream, "isatty") or not stream.isatty()
+    @classmethod
+    def _write(cls, data: bytes) -> None:
+        async_writer = cls.async_writer
+        if async_writer is not None:
+            async_writer.put(data)
+        else:
+            write_stdout(data)
 
-        if not cls.settings["color"] or is_redirected(stream=sys.stdout):
-            text_no_tabs = Color.clear(text_no_tabs)
+# sinks: write(text) is called under Trace.lock -> no own locking needed
+#  - text_format: result of the formatter "text" -> "color", "plain" or "csv"
+#  - write() must be implemented (abc: TypeError when the sink is created), flush/close/after_fork are optional
 
-        # https://docs.python.org/3/library/sys.html#sys.displayhook
+class TraceSink(ABC):
+    text_format: str = "plain"
 
-        data = (text_no_tabs + "\n").encode("utf-8", "backslashreplace")
-        if hasattr(sys.stdout, "buffer"):
-            sys.stdout.buffer.write(data)
-            sys.stdout.flush()
-        else:
-            text = data.decode("utf-8", "strict")
-            sys.stdout.write(text)
+    @abstractmethod
+    def write(self, text: str) -> None: ...
+
+    def flush(self) -> None:  # noqa: B027 (optional, default: nothing to flush)
+        pass
+
+    def close(self) -> None:  # noqa: B027 (optional, default: nothing to close)
+        pass
+
+    def after_fork(self) -> None:  # noqa: B027 (optional, child process: new locks)
+        pass
+
+# stdout: color (tty) or plain, async_output -> writer thread
+
+class StdoutSink(TraceSink):
+    @property
+    def text_format(self) -> str:  # type: ignore[override]
+        return "color" if Trace.stdout_color else "plain"
+
+    def write(self, text: str) -> None:
+        Trace._write((text + "\n").encode("utf-8", "backslashreplace"))  # noqa: SLF001
+
+# function(text) -> e.g. qDebug (PySide6)
+
+class CallableSink(TraceSink):
+    text_format = "color"
+
+    def __init__(self, output: Callable[[str], Any]) -> None:
+        self.output = output
+
+    def write(self, text: str) -> None:
+        self.output(text)
+
+# file_init() without path -> Trace.messages, written by file_save()
+
+class MemorySink(TraceSink):
+    def __init__(self, messages: List[str], csv: bool = False) -> None:
+        self.messages    = messages
+        self.text_format = "csv" if csv else "plain"
+
+    def write(self, text: str) -> None:
+        self.messages.append(text)
+
+# last N messages (e.g. for an error dialog): RingBufferSink(1000).lines()
+
+class RingBufferSink(TraceSink):
+    def __init__(self, size: int, csv: bool = False) -> None:
+        self.buffer: Deque[str] = deque(maxlen=max(1, size))
+        self.text_format = "csv" if csv else "plain"
+
+    def write(self, text: str) -> None:
+        self.buffer.append(text)
+
+    def lines(self) -> List[str]:
+        with Trace.lock:
+            return list(self.buffer)
+
+# https://docs.python.org/3/library/sys.html#sys.displayhook
+
+def write_stdout(data: bytes) -> None:
+    if hasattr(sys.stdout, "buffer"):
+        sys.stdout.buffer.write(data)
+        sys.stdout.flush()
+    else:
+        text = data.decode("utf-8", "strict")
+        sys.stdout.write(text)
+
+# "13-26-14.768+0100" -> part of the trace filename
+
+def get_file_time() -> str:
+    return Trace._get_time_timezone(Trace.settings["timezone"], time.time_ns()).replace(":", "-")  # noqa: SLF001
+
+# streaming trace file: buffered appends, the memory usage is independent of the runtime
+#  - "<filename> • <time>.txt"
+#  - rotation by size (max_bytes) and/or age (max_seconds) -> next file "<filename> • <new time>.txt"
+#  - compress: rotated file -> "<filename> • <time>.txt.gz"
+#  - max_files: only the last max_files rotated files are kept (files of this writer only)
+
+class FileWriter(TraceSink):
+    def __init__(
+        self,
+        path: Path,
+        filename: str,
+        *,
+        max_bytes: int = 0,
+        max_seconds: float = 0,
+        compress: bool = False,
+        csv: bool = False,
+        max_files: int = 0,
+    ) -> None:
+        self.path        = path
+        self.filename    = filename
+        self.max_bytes   = max_bytes
+        self.max_seconds = max_seconds
+        self.compress    = compress
+        self.max_files   = max_files
+        self.text_format = "csv" if csv else "plain"
+
+        self.rotated: Deque[Path] = deque() # rotated files of this writer (oldest first)
+
+        self.lock = threading.Lock()
+        self._open()
+
+    def write(self, text: str) -> None:
+        data = (text + "\n").encode("utf-8", "backslashreplace")
+
+        with self.lock:
+            if self.size > 0 and (
+                (self.max_bytes > 0 and self.size + len(data) > self.max_bytes)
+                or (self.max_seconds > 0 and time.monotonic() - self.opened >= self.max_seconds)
+            ):
+                self._rotate()
+
+            self.file.write(data)
+            self.size += len(data)
+
+    def flush(self) -> None:
+        with self.lock:
+            self.file.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+    def after_fork(self) -> None:
+        self.lock = threading.Lock()
+
+    def _open(self) -> None:
+        if not self.path.is_dir():
+            self.path.mkdir(parents=True)
+
+        file_time = get_file_time()
+        file_path = self.path / f"{self.filename} • {file_time}.txt"
+
+        number = 1
+        while file_path.exists() or file_path.with_name(file_path.name + ".gz").exists():
+            number += 1
+            file_path = self.path / f"{self.filename} • {file_time} ({number}).txt"
+
+        self.file_path = file_path
+        self.file      = file_path.open(mode="ab", buffering=64 * 1024)
+        self.size      = 0
+        self.opened    = time.monotonic()
+
+    def _rotate(self) -> None:
+        self.file.close()
+
+        rotated_path = self.file_path
+        if self.compress:
+            rotated_path = self.file_path.with_name(self.file_path.name + ".gz")
+            with self.file_path.open(mode="rb") as source, gzip.open(rotated_path, mode="wb") as dest:
+                shutil.copyfileobj(source, dest)
+            self.file_path.unlink()
+
+        if self.max_files > 0:
+            self.rotated.append(rotated_path)
+            while len(self.rotated) > self.max_files:
+                with contextlib.suppress(OSError):
+                    self.rotated.popleft().unlink()
+
+        self._open()
+
+# async output: bounded queue + writer thread (batched writes, one flush per batch)
+#  - policy "block":       caller waits until the writer has made room
+#  - policy "drop_oldest": the oldest queued message is discarded (counted)
+#  - policy "drop":        the new message is discarded (counted)
+
+class AsyncWriter:
+    def __init__(self, queue_size: int, flush_interval: float, policy: str) -> None:
+        self.queue: Deque[bytes] = deque()
+        self.queue_size     = max(1, queue_size)
+        self.flush_interval = flush_interval
+        self.policy         = policy
+
+        self.queued  = 0 # sequence numbers -> flush()
+        self.written = 0
+        self.dropped = 0
+
+        self.running   = True
+        self.condition = threading.Condition()
+
+        self.thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, data: bytes) -> None:
+        with self.condition:
+            if len(self.queue) >= self.queue_size:
+                if self.policy == "drop":
+                    self.dropped += 1
+                    return
+
+                if self.policy == "drop_oldest":
+                    self.queue.popleft()
+                    self.written += 1
+                    self.dropped += 1
+
+                else: # "block"
+                    while len(self.queue) >= self.queue_size and self.thread.is_alive():
+                        self.condition.notify_all()
+                        self.condition.wait(self.flush_interval)
+
+            self.queue.append(data)
+            self.queued += 1
+
+            # wake up the writer early, if the queue is half full
+
+            if len(self.queue) * 2 >= self.queue_size:
+                self.condition.notify_all()
+
+    def flush(self) -> None:
+        with self.condition:
+            target = self.queued
+            self.condition.notify_all()
+            while self.written < target and self.thread.is_alive():
+                self.condition.wait(self.flush_interval)
+
+    def close(self) -> None:
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        self.thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                if self.running and not self.queue:
+                    self.condition.wait(self.flush_interval)
+
+                batch = list(self.queue)
+                self.queue.clear()
+                running = self.running
+
+            if batch:
+                try:
+                    write_stdout(b"".join(batch))
+                except (OSError, ValueError):
+                    pass # stdout closed
+
+            with self.condition:
+                self.written += len(batch)
+                self.condition.notify_all()
+
+            if not running and not batch:
+                return
+
+Trace._check_tty()  # noqa: SLF001
+Trace.add_sink("stdout", StdoutSink())
+
+if hasattr(os, "register_at_fork"): # not on Windows
+    os.register_at_fork(after_in_child=Trace._after_fork_child)  # noqa: SLF001
@@ -1,5 +1,5 @@
 """
-    © Jürgen Schoenemeyer, 03.04.2025 20:50
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
 
     src/utils/zip.py
 
@@ -16,7 +16,7 @@
 from typing import Any, Dict, List
 from zipfile import ZIP_DEFLATED, ZipFile
 
-from utils.file import get_trace_path
+from utils.file import get_trace_path, walk_files
 from utils.trace import Trace
 
 def check_zip(myzip: ZipFile, path: Path | str, files: List[str]) -> Dict[str, Any]:
@@ -61,8 +61,8 @@ def create_zip(source_path: Path | str, dest_path: Path | str, filename: str, co
     src_path = source_path.expanduser().resolve(strict=True)
     try:
         with ZipFile(dest_path / filename, "w", ZIP_DEFLATED, compresslevel=compression) as zf:
-            for file in src_path.rglob("*"):
-                zf.write(file, file.relative_to(src_path))
+            for entry in walk_files(src_path, dirs=True):
+                zf.write(entry.path, entry.relative)
     except OSError as e:
         Trace.error(f"{e}")
         return False
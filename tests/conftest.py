@@ -0,0 +1,15 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
+
+    tests/conftest.py
+
+    python -m pytest tests
+    uv run pytest tests
+"""
+from __future__ import annotations
+
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
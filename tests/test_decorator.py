@@ -0,0 +1,382 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
+
+    tests/test_decorator.py
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Protocol
+
+import pytest
+
+from utils import decorator
+from utils.decorator import (
+    RetryBudget,
+    duration,
+    duration_cm,
+    get_duration_stats,
+    profile_cm,
+    retry_exception,
+    type_check,
+)
+from utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+class FailError(Exception):
+    pass
+
+# aggregate=True fills the registry -> cleared after each test, otherwise the atexit report_durations() prints into the pytest output
+
+@pytest.fixture(autouse=True)
+def clear_duration_registry() -> Iterator[None]:
+    yield
+    with decorator.duration_lock:
+        decorator.duration_registry.clear()
+
+# @duration(memory=True): tracemalloc is stopped again, also if the function raises
+
+def test_duration_memory_raises() -> None:
+    @duration(memory=True)
+    def fail() -> None:
+        raise FailError
+
+    with pytest.raises(FailError):
+        fail()
+
+    assert not tracemalloc.is_tracing()
+
+def test_duration_memory_raises_async() -> None:
+    @duration(memory=True)
+    async def fail() -> None:
+        raise FailError
+
+    with pytest.raises(FailError):
+        asyncio.run(fail())
+
+    assert not tracemalloc.is_tracing()
+
+def test_duration_cm_memory_raises() -> None:
+    with pytest.raises(FailError), duration_cm("fail", memory=True):
+        raise FailError
+
+    assert not tracemalloc.is_tracing()
+
+# @duration_cm(...) as decorator: one timer for all calls (rounds)
+
+def test_duration_cm_decorator() -> None:
+    timer = duration_cm("add", rounds=3)
+
+    @timer
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    assert add(1, 2) == 3
+    assert add(2, 3) == 5
+    assert timer.calls == 2
+
+    add(3, 4)
+    assert timer.calls == 0 # statistics after the 3rd call
+
+# @duration(aggregate=True): methods with the same name on different classes -> separate statistics
+
+def test_duration_aggregate_qualname() -> None:
+    class A:
+        @duration(aggregate=True)
+        def run(self) -> None:
+            pass
+
+    class B:
+        @duration(aggregate=True)
+        def run(self) -> None:
+            pass
+
+    A().run()
+    B().run()
+    A().run()
+
+    stats = get_duration_stats(f"{__name__}.{A.run.__qualname__}")
+    assert stats.count == 2
+    assert get_duration_stats(f"{__name__}.{B.run.__qualname__}").count == 1
+
+# @memoize(persist=...): the disk key does not depend on the string hash order (PYTHONHASHSEED) of the run
+
+MEMO_SCRIPT = """
+import sys
+from utils.decorator import memoize
+
+@memoize(persist=sys.argv[1])
+def count(tags, **kwargs):
+    print("called")
+    return len(tags) + len(kwargs)
+
+count({"alpha", "beta", "gamma", "delta"}, options={"b": 1, "a": {"x", "y", "z"}})
+"""
+
+def test_memoize_persist_hash_seed(tmp_path: Path) -> None:
+    outputs = []
+    for seed in ["1", "2", "3"]:
+        result = subprocess.run(
+            [sys.executable, "-c", MEMO_SCRIPT, str(tmp_path)],
+            cwd=Path(__file__).parent.parent / "src", env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True, text=True, timeout=30, check=True,
+        )
+        outputs.append(result.stdout.count("called"))
+
+    assert outputs == [1, 0, 0]
+
+# @retry_exception: backoff, max_delay, jitter bounds, deadline, shared RetryBudget
+#  -> time.sleep / time.monotonic replaced by a fake clock (sleep advances the clock)
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(time, "sleep", fake.sleep)
+    return fake
+
+def always_fail(calls: List[int]) -> None:
+    calls.append(1)
+    raise FailError
+
+def test_retry_backoff(clock: FakeClock) -> None:
+    calls: List[int] = []
+
+    @retry_exception(exception=FailError, delay=1, retries=5, backoff=2)
+    def fail() -> None:
+        always_fail(calls)
+
+    with pytest.raises(FailError):
+        fail()
+
+    assert len(calls) == 5
+    assert clock.sleeps == [1, 2, 4, 8]
+
+def test_retry_max_delay(clock: FakeClock) -> None:
+    @retry_exception(exception=FailError, delay=1, retries=5, backoff=2, max_delay=3)
+    def fail() -> None:
+        raise FailError
+
+    with pytest.raises(FailError):
+        fail()
+
+    assert clock.sleeps == [1, 2, 3, 3]
+
+def test_retry_jitter_bounds(clock: FakeClock) -> None:
+    random.seed(1)
+
+    @retry_exception(exception=FailError, delay=1, retries=8, backoff=2, jitter="full")
+    def fail_full() -> None:
+        raise FailError
+
+    with pytest.raises(FailError):
+        fail_full()
+
+    assert len(clock.sleeps) == 7
+    assert all(0 <= sleep <= 2 ** i for i, sleep in enumerate(clock.sleeps))
+
+    clock.sleeps.clear()
+
+    @retry_exception(exception=FailError, delay=1, retries=8, jitter="decorrelated", max_delay=5)
+    def fail_decorrelated() -> None:
+        raise FailError
+
+    with pytest.raises(FailError):
+        fail_decorrelated()
+
+    previous = 1.0 # first sleep: between delay and 3 * delay
+    for sleep in clock.sleeps:
+        assert 1 <= sleep <= min(5, previous * 3)
+        previous = sleep
+
+def test_retry_deadline(clock: FakeClock) -> None:
+    calls: List[int] = []
+
+    @retry_exception(exception=FailError, delay=1, retries=10, backoff=2, deadline=5)
+    def fail() -> None:
+        always_fail(calls)
+
+    with pytest.raises(FailError):
+        fail()
+
+    assert clock.sleeps == [1, 2] # 3rd retry: 3 + 4 sec > deadline 5 sec
+    assert len(calls) == 3
+
+def test_retry_budget_exhausted(clock: FakeClock) -> None:
+    budget = RetryBudget(capacity=2, per_second=0.5)
+    calls_a: List[int] = []
+    calls_b: List[int] = []
+
+    @retry_exception(exception=FailError, delay=0, retries=5, budget=budget)
+    def fail_a() -> None:
+        always_fail(calls_a)
+
+    @retry_exception(exception=FailError, delay=0, retries=5, budget=budget)
+    def fail_b() -> None:
+        always_fail(calls_b)
+
+    with pytest.raises(FailError):
+        fail_a()
+    with pytest.raises(FailError):
+        fail_b()
+
+    assert len(calls_a) == 3 # 2 retries -> budget empty
+    assert len(calls_b) == 1 # no retry left (shared budget)
+
+    clock.now += 2 # + 1 token
+    assert budget.acquire()
+    assert not budget.acquire()
+
+def test_retry_success(clock: FakeClock) -> None:
+    calls: List[int] = []
+
+    @retry_exception(exception=FailError, delay=1, retries=5)
+    def fail_twice() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise FailError
+        return "ok"
+
+    assert fail_twice() == "ok"
+    assert clock.sleeps == [1, 1]
+
+# profile_cm: code directly in the with block (no called function) -> reported as "<block>", collapsed file not empty
+
+def test_profile_cm_inline_block(tmp_path: Path) -> None:
+    texts: List[str] = []
+    Trace.add_sink("list", texts.append)
+    try:
+        with profile_cm("inline", folder=tmp_path, output="collapsed"):
+            total = 0
+            for i in range(200_000):
+                total += i
+        Trace.flush()
+    finally:
+        Trace.remove_sink("list")
+
+    summary = next(text for text in texts if "inline:" in text)
+    assert "<block>" in summary
+    assert not summary.rstrip().endswith("top:")
+
+    files = list(tmp_path.glob("*.collapsed.txt"))
+    assert len(files) == 1
+    lines = files[0].read_text(encoding="utf-8").splitlines()
+    assert lines
+    assert all(line.startswith("<block>") for line in lines)
+
+# @type_check: arguments (positional, keyword, *args, **kwargs) and return value -> TypeError
+
+def test_type_check_pass() -> None:
+    @type_check
+    def scale(value: float, factor: int = 2, *, name: str = "") -> float:
+        return value * factor
+
+    assert scale(1.5) == 3.0
+    assert scale(2, 3) == 6 # int accepted for float
+    assert scale(1.0, factor=4, name="x") == 4.0
+
+def test_type_check_fail() -> None:
+    @type_check
+    def scale(value: float, factor: int = 2, *, name: str = "") -> float:
+        return value * factor
+
+    with pytest.raises(TypeError, match=r"argument 'value' - expected float \| int, but got str"):
+        scale("1")  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="argument 'factor'"):
+        scale(1.0, factor=2.0)  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="argument 'name'"):
+        scale(1.0, name=1)  # type: ignore[arg-type]
+
+    @type_check
+    def wrong_result() -> int:
+        return "text"  # type: ignore[return-value]
+
+    with pytest.raises(TypeError, match="return value - expected int, but got str"):
+        wrong_result()
+
+def test_type_check_var_args() -> None:
+    @type_check
+    def join(*parts: str, **options: int) -> str:
+        return "".join(parts) + str(sum(options.values()))
+
+    assert join("a", "b", x=1) == "ab1"
+    with pytest.raises(TypeError, match=r"argument '\*args'"):
+        join("a", 1)  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="argument 'x'"):
+        join("a", x="1")  # type: ignore[arg-type]
+
+def test_type_check_generic_union() -> None:
+    @type_check
+    def first(values: List[int], default: int | None = None, mapping: Dict[str, Any] | None = None) -> int | None:
+        return values[0] if values else default
+
+    assert first([1, 2]) == 1
+    assert first([], None, {"a": 1}) is None
+
+    with pytest.raises(TypeError, match="expected list"):
+        first((1, 2))  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match=r"expected int \| NoneType"):
+        first([], "a")  # type: ignore[arg-type]
+    with pytest.raises(TypeError, match="argument 'mapping'"):
+        first([1], mapping=[])  # type: ignore[arg-type]
+
+    @type_check
+    def size(values: List[int]) -> int:
+        return len(values)
+
+    assert size(["a"]) == 1  # type: ignore[list-item] # shallow: only list is checked
+
+def test_type_check_explicit_types() -> None:
+    @type_check(int, str)
+    def pair(a, b, c: float):  # type: ignore[no-untyped-def] # noqa: ANN001, ANN202
+        return (a, b, c)
+
+    assert pair(1, "b", 2) == (1, "b", 2)
+    with pytest.raises(TypeError, match="argument 'b'"):
+        pair(1, 2, 3.0)
+    with pytest.raises(TypeError, match="argument 'c'"):
+        pair(1, "b", "c")
+
+class Named(Protocol):
+    name: str
+
+def test_type_check_unsupported() -> None:
+    texts: List[str] = []
+    Trace.add_sink("list", texts.append)
+    try:
+        @type_check
+        def unchecked(a: Any, b: Named, c: Missing, d: int) -> object:  # type: ignore[name-defined] # noqa: F821
+            return (a, b, c, d)
+
+        assert unchecked(1, 2, 3, 4) == (1, 2, 3, 4) # Any, non-runtime Protocol, unresolvable: not checked
+        with pytest.raises(TypeError, match="argument 'd'"):
+            unchecked(1, 2, 3, "4")
+        Trace.flush()
+    finally:
+        Trace.remove_sink("list")
+
+    warnings = [text for text in texts if "not checked" in text]
+    assert len(warnings) == 1 # only once, at the first call
+    assert "annotation 'c'" in warnings[0]
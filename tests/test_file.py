@@ -0,0 +1,114 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
+
+    tests/test_file.py
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List
+
+import pytest
+
+from utils import file_io
+from utils.file import (
+    export_file,
+    export_json,
+    export_text,
+    listdir_match_extention,
+    save_digest_indexes,
+    scan_folder,
+    set_digest_index_path,
+    walk_files,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+@pytest.fixture
+def digest_cache(tmp_path: Path) -> Iterator[Path]:
+    default_path = file_io.digest_index_path
+    cache_path = tmp_path / "cache"
+
+    set_digest_index_path(cache_path)
+    yield cache_path
+    set_digest_index_path(default_path)
+
+# digest_index=True: the index is kept in the cache folder, not next to the exported files
+
+def test_digest_index_not_in_output_folder(tmp_path: Path, digest_cache: Path) -> None:
+    folder = tmp_path / "out"
+
+    export_text(folder, "a.txt", "text", digest_index=True)
+    export_json(folder, "b.json", {"a": 1}, digest_index=True)
+    export_file(folder, "c.json", '{"c": 2}', digest_index=True)
+    export_text(folder, "a.txt", "text", digest_index=True) # unchanged
+    save_digest_indexes()
+
+    assert sorted(path.name for path in folder.iterdir()) == ["a.txt", "b.json", "c.json"]
+    assert listdir_match_extention(folder, ["json"])[0] == ["b.json", "c.json"]
+    assert sorted(scan_folder(folder)[0]) == ["a.txt", "b.json", "c.json"]
+    assert sorted(entry.relative for entry in walk_files(tmp_path / "out")) == ["a.txt", "b.json", "c.json"]
+
+    assert len(list(digest_cache.glob("out • *.json"))) == 1
+
+# os.utime fails: the file is written -> True (error traced), also with atomic=True
+
+@pytest.mark.parametrize("atomic", [False, True])
+def test_export_text_timestamp_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, atomic: bool) -> None:
+    def utime_error(*_args: Any, **_kwargs: Any) -> None:
+        error = "utime"
+        raise PermissionError(error)
+
+    monkeypatch.setattr(file_io.os, "utime", utime_error)
+
+    assert export_text(tmp_path, "a.txt", "text", timestamp=1_000_000_000.0, atomic=atomic) is True
+    assert (tmp_path / "a.txt").read_text(encoding="utf-8") == "text"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.txt"] # no temp file left
+
+# walk_files: max_depth, exclude prunes folders, symlink loops, workers -> same entries as the serial walk
+
+@pytest.fixture
+def walk_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "tree"
+    for relative in ["a.txt", "b.json", "sub/c.txt", "sub/deep/d.txt", "skip/e.txt", "skip/inner/f.txt"]:
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_text(relative, encoding="utf-8")
+    for i in range(20):
+        (root / "many" / f"folder{i}").mkdir(parents=True)
+        (root / "many" / f"folder{i}" / "g.txt").write_text("g", encoding="utf-8")
+    return root
+
+def walk_relative(root: Path, **kwargs: Any) -> List[str]:
+    return sorted(entry.relative for entry in walk_files(root, **kwargs))
+
+def test_walk_files_max_depth(walk_tree: Path) -> None:
+    assert walk_relative(walk_tree, max_depth=0) == ["a.txt", "b.json"]
+    assert "sub/c.txt" in walk_relative(walk_tree, max_depth=1)
+    assert "sub/deep/d.txt" not in walk_relative(walk_tree, max_depth=1)
+    assert "sub/deep/d.txt" in walk_relative(walk_tree)
+
+def test_walk_files_include_exclude(walk_tree: Path) -> None:
+    relatives = walk_relative(walk_tree, exclude=["skip", "many"])
+    assert relatives == ["a.txt", "b.json", "sub/c.txt", "sub/deep/d.txt"] # whole folders pruned
+
+    assert walk_relative(walk_tree, include=["*.json"]) == ["b.json"]
+    assert walk_relative(walk_tree, include=["sub/deep/*"]) == ["sub/deep/d.txt"]
+
+def test_walk_files_symlink_loop(walk_tree: Path) -> None:
+    try:
+        (walk_tree / "sub" / "deep" / "loop").symlink_to(walk_tree / "sub", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not available")
+
+    relatives = walk_relative(walk_tree, follow_symlinks=True)
+    assert relatives.count("sub/deep/d.txt") == 1
+    assert not any("loop/" in relative for relative in relatives)
+
+    assert "sub/deep/loop" in walk_relative(walk_tree) # not followed -> yielded as file entry
+
+def test_walk_files_workers(walk_tree: Path) -> None:
+    serial   = walk_relative(walk_tree, dirs=True)
+    parallel = walk_relative(walk_tree, dirs=True, workers=4)
+    assert parallel == serial
+    assert len(serial) == len(set(serial))
@@ -0,0 +1,244 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 10:12
+
+    tests/test_trace.py
+"""
+from __future__ import annotations
+
+import gzip
+import os
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Tuple
+
+import pytest
+
+from utils.trace import FileWriter, StdoutSink, Trace, TraceSink
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+SRC_PATH = Path(__file__).parent.parent / "src"
+
+# fork while another thread holds Trace.lock, async_output=True
+#  -> the child must not deadlock and its message must be written
+
+FORK_SCRIPT = """
+import os, threading
+from utils.trace import Trace
+
+Trace.set(async_output=True)
+
+hold = threading.Event()
+release = threading.Event()
+
+def holder():
+    with Trace.lock:
+        hold.set()
+        release.wait()
+
+threading.Thread(target=holder, daemon=True).start()
+hold.wait()
+
+pid = os.fork()
+if pid == 0:
+    Trace.info("child message")
+    Trace.flush()
+    os._exit(0)
+
+release.set()
+os.waitpid(pid, 0)
+Trace.info("parent message")
+Trace.flush()
+"""
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork() not available")
+def test_async_output_fork() -> None:
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", FORK_SCRIPT],
+        cwd=SRC_PATH, capture_output=True, text=True, timeout=30, check=True,
+    )
+
+    assert "child message" in result.stdout
+    assert "parent message" in result.stdout
+
+# lazy message: not built if no sink receives the trace_type
+
+def test_lazy_message_without_sink() -> None:
+    calls: List[int] = []
+
+    def message() -> str:
+        calls.append(1)
+        return "lazy"
+
+    Trace.remove_sink("stdout")
+    try:
+        Trace.info(message)
+    finally:
+        Trace.add_sink("stdout", StdoutSink())
+
+    assert calls == []
+
+    Trace.info(message)
+    assert calls == [1]
+
+# TraceSink: write() is abstract -> a sink without write() fails when it is created
+
+def test_sink_without_write() -> None:
+    class NoWriteSink(TraceSink):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWriteSink()  # type: ignore[abstract]
+
+    class ListSink(TraceSink):
+        def __init__(self) -> None:
+            self.texts: List[str] = []
+
+        def write(self, text: str) -> None:
+            self.texts.append(text)
+
+    sink = ListSink()
+    Trace.add_sink("list", sink)
+    try:
+        Trace.error("sink message")
+    finally:
+        Trace.remove_sink("list")
+
+    assert any("sink message" in text for text in sink.texts)
+
+# FileWriter: rotation by size and by age, gzip of the rotated files, max_files
+
+def test_file_rotation_size(tmp_path: Path) -> None:
+    writer = FileWriter(tmp_path, "log", max_bytes=100)
+    for i in range(20):
+        writer.write(f"message {i:02d} " + "x" * 20) # 32 bytes per line -> 3 lines per file
+    writer.close()
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 7
+    assert all(path.stat().st_size <= 100 for path in files)
+
+    lines = "".join(path.read_text(encoding="utf-8") for path in files).splitlines()
+    assert sorted(lines) == [f"message {i:02d} " + "x" * 20 for i in range(20)]
+
+def test_file_rotation_time(tmp_path: Path) -> None:
+    writer = FileWriter(tmp_path, "log", max_seconds=60)
+    writer.write("first")
+    writer.write("second")
+    writer.opened -= 61 # file is older than max_seconds
+    writer.write("third")
+    writer.close()
+
+    texts = sorted(path.read_text(encoding="utf-8") for path in tmp_path.iterdir())
+    assert texts == ["first\nsecond\n", "third\n"]
+
+def test_file_rotation_compress_max_files(tmp_path: Path) -> None:
+    writer = FileWriter(tmp_path, "log", max_bytes=10, compress=True, max_files=2)
+    for i in range(5):
+        writer.write(f"line {i}") # 7 bytes -> one line per file
+    writer.close()
+
+    compressed = [path for path in tmp_path.iterdir() if path.suffix == ".gz"]
+    current    = [path for path in tmp_path.iterdir() if path.suffix == ".txt"]
+
+    assert sorted(gzip.decompress(path.read_bytes()) for path in compressed) == [b"line 2\n", b"line 3\n"]
+    assert [path.read_text(encoding="utf-8") for path in current] == ["line 4\n"]
+
+def test_file_init_streaming(tmp_path: Path) -> None:
+    Trace.file_init(["error"], path=tmp_path, filename="trace", max_bytes=1000)
+    try:
+        Trace.error("streamed")
+        Trace.info("not in the file")
+    finally:
+        Trace.file_save() # streaming: close
+
+    texts = [path.read_text(encoding="utf-8") for path in tmp_path.iterdir()]
+    assert len(texts) == 1
+    assert "streamed" in texts[0]
+    assert "not in the file" not in texts[0]
+
+# dedup_window / rate_limit: time.time_ns() monkeypatched -> no sleeps
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 1_800_000_000 * 1_000_000_000
+
+    def time_ns(self) -> int:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += int(seconds * 1_000_000_000)
+
+@pytest.fixture
+def filtered(monkeypatch: pytest.MonkeyPatch) -> Iterator[Tuple[FakeTime, List[str]]]:
+    fake = FakeTime()
+    monkeypatch.setattr(time, "time_ns", fake.time_ns)
+
+    texts: List[str] = []
+    Trace.add_sink("list", texts.append)
+    try:
+        yield fake, texts
+    finally:
+        Trace.set(dedup_window=0, rate_limit=0, rate_burst=10)
+        Trace.remove_sink("list")
+
+def count(texts: List[str], part: str) -> int:
+    return sum(part in text for text in texts)
+
+def test_dedup_window(filtered: Tuple[FakeTime, List[str]]) -> None:
+    fake, texts = filtered
+    Trace.set(dedup_window=5.0)
+
+    for _ in range(4):
+        Trace.info("same message")
+        fake.advance(1)
+    Trace.info("other message")
+
+    assert count(texts, "same message") == 1
+    assert count(texts, "other message") == 1
+    assert count(texts, "repeated") == 0
+
+    fake.advance(2) # window of the first message is over
+    Trace.info("same message")
+
+    assert count(texts, "repeated 3 times") == 1
+    assert count(texts, "same message") == 3 # first, summary, new window
+
+def test_dedup_flush(filtered: Tuple[FakeTime, List[str]]) -> None:
+    _fake, texts = filtered
+    Trace.set(dedup_window=60.0)
+
+    for _ in range(3):
+        Trace.info("flushed message")
+    assert count(texts, "repeated") == 0
+
+    Trace.flush()
+    assert count(texts, "repeated 2 times") == 1
+
+    Trace.flush()
+    assert count(texts, "repeated") == 1 # reported once
+
+def test_rate_limit(filtered: Tuple[FakeTime, List[str]]) -> None:
+    fake, texts = filtered
+    Trace.set(rate_limit=1, rate_burst=2)
+
+    def emit(i: int) -> None:
+        Trace.info(f"rate message {i}") # token bucket per call site -> always this line
+
+    for i in range(5):
+        emit(i)
+    assert [count(texts, f"rate message {i}") for i in range(5)] == [1, 1, 0, 0, 0]
+
+    fake.advance(1) # + 1 token
+    emit(5)
+    assert count(texts, "rate message 5") == 1
+    assert count(texts, "3 message(s) suppressed (rate limit)") == 1
+
+    emit(6)
+    Trace.flush()
+    assert count(texts, "rate message 6") == 0
+    assert count(texts, "1 message(s) suppressed (rate limit)") == 1